@@ -0,0 +1,34 @@
+import random
+
+import numpy as np
+
+from typeshift import batch, talk1
+from typeshift.constraints import popcount, seed2packed
+from typeshift.words import words_of_length
+
+
+def test_popcount32():
+    masks = np.array([[0, 1, 0b1011], [2 ** 25, 2 ** 26 - 1, 7]], dtype=np.uint32)
+    assert batch.popcount32(masks).tolist() == [[0, 1, 3], [1, 26, 3]]
+
+
+def test_score_games_agrees_with_spec():
+    rng = random.Random(0)
+    games = [sorted(rng.sample(words_of_length(5), 4)) for _ in range(200)]
+
+    scores = batch.score_games(batch.encode_games(games), batch.word_matrix(5))
+
+    for game, num_valid, excess_chars, parsimonious in zip(
+            games, scores.num_valid, scores.excess_chars, scores.parsimonious):
+        assert num_valid == len(talk1.Spec.from_words(game).brute_force())
+        assert excess_chars == 20 - popcount(seed2packed(game))
+        assert parsimonious == (excess_chars == 0)
+
+
+def test_rank_games_puts_parsimonious_games_first():
+    games = [['aa', 'ab'], ['ab', 'ba'], ['aa', 'bb']]
+    scores = batch.score_games(batch.encode_games(games), batch.encode_words(['aa', 'ab', 'ba', 'bb']))
+
+    assert scores.parsimonious.tolist() == [False, True, True]
+    assert scores.num_valid.tolist() == [2, 4, 4]
+    assert batch.rank_games(scores).tolist() == [1, 2, 0]
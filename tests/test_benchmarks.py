@@ -0,0 +1,22 @@
+from typeshift import benchmarks
+
+
+def test_puzzles_are_reproducible():
+    assert benchmarks.puzzle(5, 6) == benchmarks.puzzle(5, 6)
+    assert benchmarks.puzzle(5, 6, seed=1) != benchmarks.puzzle(5, 6)
+    assert len(benchmarks.puzzle(5, 6)) == 6
+
+
+def test_run_and_compare():
+    results = benchmarks.run(['brute_force', 'exact'], lengths=[4], seeds=[3, 5], repeat=2, log=None)
+    records = results['results']
+
+    assert [(r['solver'], r['num_words']) for r in records] == [
+        ('brute_force', 3), ('brute_force', 5), ('exact', 3), ('exact', 5)]
+    assert all(r['status'] == 'ok' and len(r['times']) == 2 and r['memory_peak'] > 0 for r in records)
+    assert [r['result_size'] for r in records[2:]] == [3, 5]
+
+    assert benchmarks.compare(results, results) == []
+
+    slower = {**results, 'results': [{**r, 'median': r['median'] * 10} for r in records]}
+    assert len(benchmarks.compare(results, slower)) == 4
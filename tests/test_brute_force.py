@@ -0,0 +1,65 @@
+import gc
+import random
+
+from typeshift import talk1, talk2
+from typeshift.index import WordIndex
+from typeshift.words import WORD_FILE, index_for, word_index, word_set, words_of_length
+
+
+def test_brute_force_agrees_with_product_brute_force():
+    rng = random.Random(0)
+
+    for _ in range(300):
+        word_length = rng.randint(3, 7)
+        num_words = rng.randint(2, 8)
+        game = sorted(rng.sample(words_of_length(word_length), num_words))
+
+        expected = talk1.Spec.from_words(game).brute_force_product()
+
+        assert talk1.Spec.from_words(game).brute_force() == expected
+        assert talk2.Spec.from_words(game).brute_force() == expected
+
+
+def test_brute_force_over_the_full_dictionary():
+    game = ['awful', 'bread', 'climb', 'empty', 'hello', 'knock', 'light']
+    spec = talk1.Spec.from_words(game, word_set(WORD_FILE))
+
+    assert spec.brute_force() == spec.brute_force_product()
+
+
+def test_brute_force_over_the_full_dictionary_with_repeated_words():
+    # 'chaplain' is in corncob twice
+    rng = random.Random(0)
+    games = [['chaplain'], sorted(['chaplain'] + rng.sample(words_of_length(8, WORD_FILE), 4))]
+
+    for game in games:
+        spec = talk1.Spec.from_words(game, word_set(WORD_FILE))
+        assert spec.brute_force() == spec.brute_force_product()
+    assert talk1.Spec.from_words(['chaplain'], word_set(WORD_FILE)).brute_force() == ['chaplain']
+
+
+def test_matching_sorts_unsorted_columns():
+    index = WordIndex.from_words(['bat', 'cat', 'cot', 'cow'])
+    assert index.matching([['c', 'b'], ['o', 'a'], ['w', 't']]) == ['bat', 'cat', 'cot', 'cow']
+
+
+def test_index_for_word_lists_is_compiled_index():
+    assert index_for(word_set(WORD_FILE)) is word_index(WORD_FILE)
+
+
+def test_index_for_sees_mutations():
+    valid_words = {'bat', 'cat'}
+    assert index_for(valid_words).matching([['b', 'c'], ['a'], ['t']]) == ['bat', 'cat']
+
+    valid_words.remove('bat')
+    assert index_for(valid_words).matching([['b', 'c'], ['a'], ['t']]) == ['cat']
+
+
+def test_in_memory_indexes_are_not_kept_alive():
+    for i in range(30):
+        valid_words = {'bat', 'cat', 'cot', f"{'abcdefghijklmnopqrstuvwxyz'[i % 26]}ow"}
+        valid_words.add('x' * (i + 4))
+        talk1.Spec.from_words(['bat', 'cow'], valid_words).brute_force()
+
+    gc.collect()
+    assert sum(isinstance(o, WordIndex) and isinstance(o.buffer, bytes) for o in gc.get_objects()) <= 8
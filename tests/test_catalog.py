@@ -0,0 +1,46 @@
+import random
+
+from typeshift.catalog import Catalog, score_game
+from typeshift.constraints import seed2packed
+
+
+def test_score_game():
+    entry = score_game(['time', 'word', 'game'])
+
+    assert entry.words == ['game', 'time', 'word']
+    assert entry.spec == seed2packed(['time', 'word', 'game'])
+    assert entry.minimal_size == 3
+    assert entry.num_valid >= 3
+    assert not entry.parsimonious
+    assert entry.difficulty == (entry.num_valid - 3).bit_length()
+
+
+def test_difficulty_varies_between_games_of_the_same_size():
+    entries = [score_game(game) for game in [['bird', 'cold', 'fish'], ['time', 'word', 'game']]]
+
+    assert [entry.minimal_size for entry in entries] == [3, 3]
+    assert entries[0].decoys < entries[1].decoys
+    assert entries[0].difficulty < entries[1].difficulty
+
+
+def test_catalog_add_and_sample(tmp_path):
+    catalog = Catalog(str(tmp_path / 'catalog.db'))
+    games = [['time', 'word', 'game'], ['bird', 'cold', 'fish'], ['area', 'city', 'road', 'self']]
+    entries = [score_game(game) for game in games]
+
+    assert catalog.add(entries) == 3
+    # already there
+    assert catalog.add(entries[:1]) == 0
+    assert sum(count for _, count in catalog.counts(4)) == 3
+
+    rng = random.Random(0)
+    sampled = {' '.join(catalog.sample(4, rng=rng).words) for _ in range(50)}
+    assert sampled == {' '.join(entry.words) for entry in entries}
+
+    difficulty = entries[0].difficulty
+    entry = catalog.sample(4, difficulty, rng=rng)
+    assert entry.difficulty == difficulty and entry in entries
+
+    assert catalog.sample(5) is None
+    assert catalog.sample(4, 99) is None
+    catalog.close()
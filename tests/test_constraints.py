@@ -0,0 +1,23 @@
+from typeshift import constraints
+from typeshift.constraints import c2m
+
+
+def test_pack_and_unpack_round_trip():
+    masks = (c2m['g'] | c2m['w'] | c2m['n'], c2m['o'] | c2m['e'] | c2m['a'])
+    assert constraints.unpack(constraints.pack(masks), 2) == masks
+
+
+def test_seed_words_and_apply():
+    puzzle = constraints.seed2packed(['neat', 'word', 'game'])
+    assert constraints.mask2chars(constraints.column(puzzle, 0)) == ['g', 'n', 'w']
+
+    for word in ['neat', 'word', 'game']:
+        assert constraints.conflicts(constraints.word2packed(word), puzzle)
+        puzzle = constraints.apply(constraints.word2packed(word), puzzle)
+
+    assert puzzle == 0
+
+
+def test_bitarray_round_trip():
+    puzzle = constraints.seed2packed(['neat', 'word', 'game'])
+    assert constraints.from_bitarrays(constraints.to_bitarrays(puzzle, 4)) == puzzle
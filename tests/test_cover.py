@@ -0,0 +1,97 @@
+from itertools import combinations
+import random
+import time
+
+import pytest
+
+from typeshift import talk1, talk2
+from typeshift.constraints import packed_words, popcount, seed2packed, word2packed
+from typeshift.cover import iter_minimum_covers, minimum_cover, remove_dominated
+from typeshift.words import words_of_length
+
+
+def test_remove_dominated_keeps_first_of_identical_covers():
+    puzzle = seed2packed(['cat', 'dog'])
+    covers = [word2packed(w) for w in ['cut', 'cat', 'cat', 'dog']]
+    assert remove_dominated(covers, puzzle) == [1, 3]
+
+
+def test_minimum_cover_of_unsatisfiable_puzzle_is_empty():
+    puzzle = seed2packed(['cat', 'dog'])
+    assert minimum_cover([word2packed('cat')], puzzle) == []
+
+
+def test_minimum_cover_stops_at_the_deadline():
+    game = ['area', 'city', 'road', 'self']
+    covers = packed_words(words_of_length(4))
+
+    with pytest.raises(TimeoutError):
+        minimum_cover(covers, seed2packed(game), deadline=time.monotonic() - 1)
+
+
+def test_exact_agrees_with_bfs():
+    rng = random.Random(0)
+
+    for _ in range(20):
+        word_length = rng.randint(4, 6)
+        game = sorted(rng.sample(words_of_length(word_length), rng.randint(3, 5)))
+
+        spec = talk2.Spec.from_words(game)
+        exact = spec.minimal_solution(method='exact')
+
+        assert len(exact) == len(spec.minimal_solution())
+        assert seed2packed(exact) & seed2packed(game) == seed2packed(game)
+        assert talk1.Spec.from_words(game).minimal_solution(method='exact') == exact
+
+
+def test_exact_solves_thirteen_seed_words():
+    game = ['awful', 'bread', 'climb', 'empty', 'hello', 'knock', 'light',
+            'music', 'often', 'range', 'staff', 'throw', 'young']
+    solution = talk2.Spec.from_words(game).minimal_solution(method='exact')
+
+    # every column has 13 distinct letters, so we can't do better than 13
+    assert len(solution) == 13
+    assert popcount(seed2packed(solution)) == popcount(seed2packed(game))
+
+
+def test_iter_minimum_covers_finds_every_minimum_cover():
+    words = words_of_length(4)
+    game = ['time', 'word', 'game', 'bird']
+    puzzle = seed2packed(game)
+    candidates = [word for word in words if seed2packed([word]) & ~puzzle == 0]
+    covers = packed_words(candidates)
+
+    size = len(minimum_cover(covers, puzzle))
+    expected = sorted(
+        list(combo) for combo in combinations(range(len(covers)), size)
+        if seed2packed([candidates[i] for i in combo]) == puzzle
+    )
+
+    found = list(iter_minimum_covers(covers, puzzle))
+    assert sorted(found) == expected
+    assert len(found) == len(set(map(tuple, found)))
+
+    assert len(list(iter_minimum_covers(covers, puzzle, limit=2))) == min(2, len(expected))
+
+
+def test_iter_minimum_covers_timeout_covers_finding_the_size():
+    rng = random.Random(0)
+    game = rng.sample(words_of_length(4), 13)
+    puzzle = seed2packed(game)
+    covers = packed_words(words_of_length(4))
+
+    assert list(iter_minimum_covers(covers, puzzle, timeout=-1)) == []
+
+    start = time.monotonic()
+    list(iter_minimum_covers(covers, puzzle, timeout=0.01))
+    assert time.monotonic() - start < 0.1
+
+
+def test_iter_minimal_solutions():
+    game = ['awful', 'bread', 'climb', 'empty', 'hello']
+    solutions = list(talk1.Spec.from_words(game).iter_minimal_solutions())
+
+    assert game in solutions
+    assert all(len(solution) == len(game) for solution in solutions)
+    assert all(seed2packed(solution) == seed2packed(game) for solution in solutions)
+    assert solutions == list(talk2.Spec.from_words(game).iter_minimal_solutions())
@@ -0,0 +1,27 @@
+import random
+
+from typeshift import talk1, talk2
+from typeshift.words import words_of_length
+
+
+def test_iddfs_finds_the_bfs_solution():
+    rng = random.Random(5)
+    for _ in range(15):
+        word_length = rng.randint(3, 6)
+        game = rng.sample(words_of_length(word_length), rng.randint(2, 4))
+
+        bfs = talk2.Spec.from_words(game).minimal_solution(max_states=0)
+
+        assert talk2.Spec.from_words(game).minimal_solution('iddfs') == bfs
+        assert talk1.Spec.from_words(game).minimal_solution('iddfs') == bfs
+        assert talk1.Spec.from_words(game).minimal_solution() == bfs
+
+
+def test_iddfs_is_minimal_on_bigger_games():
+    rng = random.Random(8)
+    for _ in range(10):
+        word_length = rng.randint(4, 6)
+        game = rng.sample(words_of_length(word_length), rng.randint(5, 8))
+        spec = talk2.Spec.from_words(game)
+
+        assert len(spec.minimal_solution('iddfs')) == len(spec.minimal_solution('exact'))
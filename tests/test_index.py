@@ -0,0 +1,66 @@
+from typeshift.constraints import chars2mask
+from typeshift.index import WordIndex, compile_index, index_bytes
+from typeshift.words import COMMON_WORD_FILE, SeedList, dictionary_file, read_words, word_index
+
+WORDS = ['neat', 'word', 'game', 'aa', 'gnat', 'zz', 'wad']
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / 'words.idx')
+    compile_index(WORDS, path)
+    index = WordIndex.load(path)
+
+    assert sorted(index.lengths()) == [2, 3, 4]
+    assert index.words(4) == ['neat', 'word', 'game', 'gnat']
+    assert index.words(5) == []
+    assert index.all_words() == WORDS
+    assert list(index.letter_masks(4)) == [chars2mask(w) for w in ['neat', 'word', 'game', 'gnat']]
+
+
+def test_recompiling_leaves_mapped_indexes_intact(tmp_path):
+    path = str(tmp_path / 'words.idx')
+    compile_index(WORDS, path)
+    old = WordIndex.load(path)
+
+    compile_index(['cat', 'dog'], path)
+
+    assert old.all_words() == WORDS
+    assert WordIndex.load(path).all_words() == ['cat', 'dog']
+    assert [p.name for p in tmp_path.iterdir()] == ['words.idx']
+
+
+def test_postings(tmp_path):
+    path = str(tmp_path / 'words.idx')
+    compile_index(WORDS, path)
+    index = WordIndex.load(path)
+
+    # 'game' and 'gnat' start with a g
+    assert index.posting(4, 0, 'g') == 0b1100
+    assert index.posting(4, 3, 't') == 0b1001
+    assert index.posting(4, 1, 'z') == 0
+
+
+def test_repeated_words_are_indexed_once():
+    index = WordIndex(index_bytes(['neat', 'word', 'neat', 'gnat']))
+
+    assert index.words(4) == ['neat', 'word', 'gnat']
+    assert index.all_words() == ['neat', 'word', 'gnat']
+    assert index.matching([['n'], ['e'], ['a'], ['t']]) == ['neat']
+
+
+def test_word_index_matches_word_file():
+    assert word_index(COMMON_WORD_FILE).all_words() == read_words(COMMON_WORD_FILE)
+
+
+def test_seed_list_from_a_frequency_list(tmp_path):
+    path = tmp_path / 'frequencies.txt'
+    path.write_text("word 900\ngame 450\nneat 12\ngnat\nwad 3000\n")
+
+    assert read_words(str(path)) == ['word', 'game', 'neat', 'gnat', 'wad']
+    assert SeedList(str(path)).words(4) == ['word', 'game', 'neat', 'gnat']
+    assert SeedList(str(path), min_count=100).words(4) == ['word', 'game']
+
+
+def test_dictionary_file():
+    assert dictionary_file('common') == COMMON_WORD_FILE
+    assert dictionary_file('data/other.txt') == 'data/other.txt'
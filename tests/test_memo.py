@@ -0,0 +1,32 @@
+from typeshift import talk2, talk3
+from typeshift.constraints import from_bitarrays, seed2packed
+from typeshift.memo import TranspositionTable
+
+
+def test_transposition_table_evicts_least_recently_seen():
+    table = TranspositionTable(max_size=2)
+
+    assert not table.seen(1)
+    assert not table.seen(2)
+    assert table.seen(1)
+    assert not table.seen(3)
+
+    assert 1 in table and 3 in table and 2 not in table
+    assert len(table) == 2
+    assert table.hits == 1
+
+
+def test_memoized_bfs_is_still_minimal():
+    for seeds in (['time', 'word', 'game', 'bird'], ['awful', 'bread', 'climb', 'empty', 'hello']):
+        spec = talk2.Spec.from_words(seeds)
+        memoized = spec.minimal_solution()
+        plain = spec.minimal_solution(max_states=0)
+
+        assert len(memoized) == len(plain) == len(spec.minimal_solution('exact'))
+
+
+def test_memoized_heap_search_solves_the_puzzle():
+    spec = talk3.Spec.from_words(['time', 'word', 'game', 'bird', 'cold', 'fish'])
+    solution = spec.minimal_solution()
+
+    assert seed2packed(solution) == from_bitarrays(spec.constraints)
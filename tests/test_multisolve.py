@@ -0,0 +1,29 @@
+import random
+
+from typeshift import talk1
+from typeshift.constraints import bits, seed2packed
+from typeshift.multisolve import solve_games, wide_bits
+from typeshift.words import words_of_length
+
+
+def test_wide_bits():
+    rng = random.Random(0)
+    for _ in range(20):
+        x = rng.getrandbits(rng.randint(0, 5000))
+        assert wide_bits(x) == bits(x)
+
+
+def test_solve_games_agrees_with_one_at_a_time():
+    rng = random.Random(1)
+    games = [rng.sample(words_of_length(4), rng.randint(2, 7)) for _ in range(60)]
+    games.append(games[0])
+
+    solutions = solve_games(games)
+    parallel = solve_games(games, processes=2)
+
+    assert solutions == parallel
+    for game, solution in zip(games, solutions):
+        spec = talk1.Spec.from_words(game)
+        assert sorted(solution.candidates) == spec.brute_force()
+        assert len(solution.minimal) == len(spec.minimal_solution('exact'))
+        assert seed2packed(solution.minimal) == seed2packed(game)
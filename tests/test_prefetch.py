@@ -0,0 +1,21 @@
+import time
+
+from typeshift.prefetch import GamePrefetcher
+from typeshift.words import words_of_length
+
+
+def test_prefetcher_fills_its_queues_and_hands_out_games():
+    prefetcher = GamePrefetcher([4, 5], depth=3, processes=2)
+    try:
+        deadline = time.time() + 30
+        while any(games.qsize() < 3 for games in prefetcher.games.values()) and time.time() < deadline:
+            time.sleep(0.1)
+
+        assert all(games.qsize() == 3 for games in prefetcher.games.values())
+
+        game = prefetcher.get(4)
+        assert game and set(game) <= set(words_of_length(4))
+        # and it asked for a replacement
+        assert prefetcher.games[4].qsize() + prefetcher.pending[4] == 3
+    finally:
+        prefetcher.close()
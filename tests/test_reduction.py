@@ -0,0 +1,51 @@
+import random
+
+from typeshift import talk2, talk4
+from typeshift.constraints import bits, seed2packed, word2packed
+from typeshift.cover import minimum_cover
+from typeshift.reduction import dominant_words, reduce_cover
+from typeshift.words import words_of_length
+
+
+def test_reduce_cover_keeps_the_minimal_size():
+    rng = random.Random(2)
+    for _ in range(30):
+        word_length = rng.randint(3, 7)
+        game = rng.sample(words_of_length(word_length), rng.randint(3, 10))
+        spec = talk2.Spec.from_words(game)
+        candidates = spec.brute_force()
+        covers = [word2packed(word) for word in candidates]
+        puzzle = seed2packed(game)
+
+        reduction = reduce_cover(covers, puzzle)
+        assert reduction.feasible
+        assert len(reduction.classes) <= len(candidates)
+        # the forced words plus a minimal cover of the reduced problem is a minimal solution
+        solution = reduction.expand(minimum_cover(reduction.masks, reduction.residual))
+        assert len(solution) == len(minimum_cover(covers, puzzle))
+        assert seed2packed(candidates[i] for i in solution) & puzzle == puzzle
+        # every member of a class covers the same part of the residual
+        for members, mask in zip(reduction.classes, reduction.masks):
+            assert all(covers[i] & reduction.residual == mask for i in members)
+
+        assert spec.minimal_solution('exact') == [candidates[i] for i in solution]
+        assert len(spec.minimal_solution('exact', reduce=False)) == len(solution)
+
+
+def test_reduce_cover_forces_the_only_cover():
+    covers = [word2packed(word) for word in ['time', 'tame', 'word']]
+    reduction = reduce_cover(covers, seed2packed(['time', 'word']))
+
+    assert reduction.forced == [0, 2] and reduction.residual == 0
+    assert not reduce_cover(covers, seed2packed(['zzzz'])).feasible
+
+
+def test_dominant_words_keep_a_largest_game():
+    index = talk4.length_index(4)
+    dominant = dominant_words(index.postings, index.conflicts)
+
+    assert 0 < len(bits(dominant)) < len(index.puzzle_words)
+    for b in range(len(index.conflicts)):
+        if not dominant >> b & 1:
+            # something kept conflicts with no more than it does
+            assert any(not index.conflicts[a] & ~index.conflicts[b] for a in bits(dominant & index.conflicts[b]))
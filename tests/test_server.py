@@ -0,0 +1,119 @@
+import asyncio
+import json
+
+import pytest
+
+from typeshift.constraints import seed2packed
+from typeshift.server import GameServer, GameStore, solve
+from typeshift.session import GameSession
+
+
+async def request(port, method, path, body=None):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    payload = json.dumps(body).encode() if body is not None else b''
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: test\r\nConnection: close\r\n"
+                 f"Content-Length: {len(payload)}\r\n\r\n".encode() + payload)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+
+    head, _, body = response.partition(b'\r\n\r\n')
+    status = int(head.split()[1])
+    return status, json.loads(body)
+
+
+def test_game_store_expires_games():
+    now = [0.0]
+    store = GameStore(ttl=10, clock=lambda: now[0])
+    game = GameSession(['time'])
+    game_id = store.add(game)
+
+    now[0] = 5
+    assert store.get(game_id) == game
+    # getting it pushed its expiry back
+    now[0] = 14
+    assert store.evict() == 0
+    now[0] = 30
+    assert store.evict() == 1
+    assert len(store) == 0
+
+
+def test_play_a_game_over_http():
+    async def play():
+        game_server = GameServer(processes=1)
+        server = await game_server.serve(port=0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            status, game = await request(port, 'POST', '/games', {'word_length': 4})
+            assert status == 201
+            game_id = game['id']
+            assert len(game['constraints']) == 4 and game['remaining'] == game['constraints']
+            assert game['needed'] == max(len(constraint) for constraint in game['constraints'])
+
+            status, solution = await request(port, 'GET', f'/games/{game_id}/solution')
+            assert status == 200 and solution['solution']
+
+            status, hint = await request(port, 'GET', f'/games/{game_id}/hint')
+            assert status == 200 and hint['hint']
+
+            status, result = await request(port, 'POST', f'/games/{game_id}/guess', {'word': 'zzzz'})
+            assert status == 200 and not result['accepted']
+
+            for word in solution['solution']:
+                status, result = await request(port, 'POST', f'/games/{game_id}/guess', {'word': word})
+                assert result['accepted']
+            assert result['solved'] and result['guesses'] == solution['solution']
+
+            assert (await request(port, 'GET', '/games/nope/hint'))[0] == 404
+            assert (await request(port, 'POST', '/games', {'word_length': 99}))[0] == 400
+            assert (await request(port, 'POST', '/games', {'word_length': 5.0}))[0] == 400
+            assert (await request(port, 'POST', '/games', {'word_length': True}))[0] == 400
+            assert (await request(port, 'POST', f'/games/{game_id}/guess', {'word': 7}))[0] == 400
+        finally:
+            server.close()
+            await server.wait_closed()
+            game_server.close()
+
+    asyncio.run(play())
+
+
+def test_slow_work_times_out():
+    async def run():
+        game_server = GameServer(processes=1, timeout=0.001)
+        try:
+            status, response = await game_server.route('POST', '/games', {'word_length': 10})
+        except Exception as e:
+            return e.status
+        finally:
+            game_server.close()
+
+    assert asyncio.run(run()) == 504
+
+
+def test_solve_gives_up_its_worker_at_the_timeout():
+    game = ['area', 'city', 'road', 'self']
+    assert len(solve(seed2packed(game), 4)) == 4
+
+    with pytest.raises(TimeoutError):
+        solve(seed2packed(game), 4, timeout=-1)
+
+
+def test_unexpected_errors_get_a_response():
+    async def run():
+        game_server = GameServer(processes=1)
+
+        async def broken(method, path, body):
+            raise TypeError("oops")
+        game_server.route = broken
+
+        server = await game_server.serve(port=0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            return await request(port, 'GET', '/games/anything/hint')
+        finally:
+            server.close()
+            await server.wait_closed()
+            game_server.close()
+
+    status, response = asyncio.run(run())
+    assert status == 500 and response == {'error': "internal server error"}
@@ -0,0 +1,41 @@
+import random
+
+from typeshift.words import word_set, words_of_length
+from typeshift.constraints import conflicts, seed2packed, word2packed, words_needed
+from typeshift.session import GameSession
+
+
+def test_guesses_update_the_session_like_a_fresh_one():
+    rng = random.Random(0)
+    for word_length in [3, 4, 5]:
+        words = words_of_length(word_length)
+        for _ in range(5):
+            seed_words = rng.sample(words, 6)
+            session = GameSession(seed_words)
+            assert session.needed == words_needed(session.puzzle, word_length)
+
+            for word in rng.sample(session.candidates, 10) + seed_words:
+                assert session.guess(word)
+                # everything tracked incrementally matches recomputing it from scratch
+                assert session.needed == words_needed(session.remaining, word_length)
+                assert session.useful_words() == [candidate for candidate in session.candidates
+                                                  if conflicts(word2packed(candidate), session.remaining)]
+
+            assert session.solved and session.needed == 0
+            assert session.useful_words() == [] and session.hint() is None
+
+
+def test_guess_rejects_words_that_dont_fit_or_arent_words():
+    session = GameSession(['time', 'word', 'game'])
+    assert not session.guess('zzzz')
+    # a real word, but no seed word starts with 'f'
+    assert 'four' in word_set() and not session.guess('four')
+    assert session.guesses == [] and session.remaining == session.puzzle == seed2packed(['time', 'word', 'game'])
+
+
+def test_hint_uses_up_the_most():
+    session = GameSession(['time', 'word', 'game'])
+    hint = session.hint()
+    session.guess(hint)
+    used = bin(session.puzzle & ~session.remaining).count('1')
+    assert all(bin(word2packed(word) & session.puzzle).count('1') <= used for word in session.candidates)
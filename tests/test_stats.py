@@ -0,0 +1,56 @@
+import json
+
+from typeshift import talk1, talk2, talk3, talk4, talk5
+from typeshift.stats import SearchStats
+
+GAME = ['time', 'word', 'game', 'bird', 'cold', 'fish']
+
+
+def test_search_stats_records_and_exports():
+    stats = SearchStats(trace_memory=True)
+    with stats.phase('search'):
+        data = [0] * 100000
+        stats.expand(3)
+        stats.expand(7)
+        stats.expand(2)
+        stats.prune('bound')
+        stats.improve(5, data[:1])
+
+    exported = json.loads(stats.to_json())
+    assert exported['nodes'] == 3
+    assert exported['frontier_peak'] == 7
+    assert exported['prunes'] == {'bound': 1}
+    assert exported['phases']['search'] > 0
+    assert exported['memory_peak'] >= 800000
+    assert [size for _, size in exported['incumbents']] == [5]
+
+
+def test_solvers_fill_in_stats():
+    for spec, methods, phases in [(talk1.Spec.from_words(GAME), ['bfs', 'exact'], {'enumerate', 'search'}),
+                                  (talk2.Spec.from_words(GAME), ['bfs', 'exact'], {'enumerate', 'reduce', 'search'}),
+                                  (talk3.Spec.from_words(GAME), ['heap', 'astar'], {'enumerate', 'reduce', 'search'})]:
+        for method in methods:
+            stats = SearchStats()
+            solution = spec.minimal_solution(method, stats=stats)
+
+            assert solution == spec.minimal_solution(method)
+            assert stats.nodes > 0
+            assert set(stats.phases) == phases
+
+
+def test_parallel_stats_are_merged():
+    sequential, parallel = SearchStats(), SearchStats()
+    games = talk4.all_puzzles(10, 7, stats=sequential)
+
+    assert sorted(talk4.all_puzzles(10, 7, processes=2, stats=parallel)) == sorted(games)
+    assert sequential.prunes and parallel.prunes
+    assert sequential.nodes > 0 and parallel.nodes > 0
+
+
+def test_most_satisfying_logs_improvements():
+    logged = []
+    stats = SearchStats(log=logged.append)
+    game = talk5.most_satisfying(3, 2, stats)
+
+    assert logged and logged[-1].startswith(f"{stats.incumbents[-1][1]} ")
+    assert str(game) in logged[-1]
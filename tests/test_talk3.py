@@ -0,0 +1,34 @@
+import random
+
+import pytest
+
+from typeshift import talk2, talk3
+from typeshift.constraints import seed2packed, words_needed
+from typeshift.words import words_of_length
+
+
+def test_astar_is_minimal():
+    rng = random.Random(3)
+    for _ in range(20):
+        word_length = rng.randint(3, 6)
+        game = rng.sample(words_of_length(word_length), rng.randint(2, 6))
+
+        solution = talk3.Spec.from_words(game).minimal_solution('astar')
+        exact = talk2.Spec.from_words(game).minimal_solution('exact')
+
+        assert len(solution) == len(exact)
+        assert seed2packed(solution) == seed2packed(game)
+
+
+def test_words_needed():
+    puzzle = seed2packed(['time', 'word', 'game'])
+
+    assert words_needed(puzzle, 4) == 3
+    assert words_needed(0, 4) == 0
+    assert words_needed(puzzle & ~seed2packed(['tame']), 4) == 2
+
+
+def test_unknown_method():
+    spec = talk3.Spec.from_words(['time', 'word'])
+    with pytest.raises(ValueError):
+        spec.minimal_solution('dfs')
@@ -0,0 +1,98 @@
+import random
+
+from typeshift import talk4
+from typeshift.constraints import popcount, seed2packed
+
+
+def is_parsimonious(game):
+    return popcount(seed2packed(game)) == sum(len(word) for word in game)
+
+
+def test_parallel_all_puzzles_agrees_with_sequential():
+    sequential = talk4.all_puzzles(10, 7)
+    parallel = talk4.all_puzzles(10, 7, processes=2, split_depth=2)
+
+    assert sorted(sequential) == sorted(parallel)
+    assert all(is_parsimonious(game) for game in sequential)
+
+
+def test_parallel_maximal_puzzle_agrees_with_sequential():
+    sequential = talk4.maximal_puzzle(10)
+    parallel = talk4.maximal_puzzle(10, processes=2)
+
+    assert len(sequential) == len(parallel) == 8
+    assert is_parsimonious(parallel)
+
+
+def test_maximal_puzzle_is_optimal():
+    best = talk4.maximal_puzzle(10)
+
+    assert talk4.all_puzzles(10, len(best))
+    assert talk4.all_puzzles(10, len(best) + 1) == []
+
+
+def test_bounds_never_undercount():
+    index = talk4.length_index(10)
+    remaining = (1 << len(index.puzzle_words)) - 1
+
+    # there is an 8-word game, so no bound may rule out growing by 8
+    assert talk4.can_grow_by(remaining, index, 8)
+
+
+def test_maximal_puzzle2_agrees_with_maximal_puzzle():
+    best = talk4.maximal_puzzle2(10)
+
+    assert len(best) == len(talk4.maximal_puzzle(10))
+    assert is_parsimonious(best)
+
+
+def test_greedy_puzzle_is_parsimonious_and_maximal():
+    index = talk4.length_index(5)
+    game = talk4.greedy_puzzle(5, 20, improve=True)
+
+    assert is_parsimonious(game)
+    # nothing else can be added to it
+    assert not any(is_parsimonious(game + [word]) for word in index.puzzle_words if word not in game)
+
+
+def test_improve_game_never_shrinks_the_game():
+    index = talk4.length_index(5)
+    order = list(range(len(index.puzzle_words)))
+
+    for seed in range(5):
+        random.Random(seed).shuffle(order)
+        pwords = talk4.greedy_pass(index, order)
+        improved = talk4.improve_game(pwords, index)
+
+        assert popcount(improved) >= popcount(pwords)
+        assert is_parsimonious(talk4.back_to_words(improved, index.puzzle_words))
+
+
+def test_parallel_greedy_puzzle():
+    game = talk4.greedy_puzzle(10, 20, processes=2)
+
+    assert is_parsimonious(game)
+
+
+def test_iter_puzzles_streams_all_puzzles():
+    games = list(talk4.iter_puzzles(10, 7))
+
+    assert sorted(games) == sorted(talk4.all_puzzles(10, 7))
+    assert list(talk4.iter_puzzles(10, 7, limit=3)) == games[:3]
+    assert list(talk4.iter_puzzles(10, 7, timeout=0)) == []
+
+
+def test_search_stack_visits_games_in_order():
+    index = talk4.length_index(10)
+    words = index.puzzle_words
+    pairs = [[a, b] for i, a in enumerate(words) for b in words[i + 1:] if is_parsimonious([a, b])]
+
+    stack = talk4.SearchStack(index)
+    visited = []
+    while stack.descend(2 - stack.depth):
+        if stack.depth == 2:
+            visited.append(stack.words())
+            stack.prune()
+
+    assert visited == pairs
+    assert stack.depth == 0
@@ -0,0 +1,21 @@
+from typeshift import talk5
+from typeshift.words import WORD_FILE, word_set
+
+
+def test_most_satisfying_agrees_with_brute_force():
+    assert talk5.most_satisfying(3, 2) == talk5.most_satisfying_brute_force(3, 2)
+
+
+def test_most_satisfying_four_letter_triple():
+    game = talk5.most_satisfying(4, 3)
+
+    assert game == ['last', 'pine', 'rock']
+    assert len(talk5.Spec.from_words(game).brute_force()) == 24
+
+
+def test_most_satisfying_counts_words_from_another_dictionary():
+    game = talk5.most_satisfying(3, 2, word_file=WORD_FILE)
+
+    assert game == talk5.most_satisfying_brute_force(3, 2, word_file=WORD_FILE)
+    # the seed words still come from the common words
+    assert set(game) <= word_set()
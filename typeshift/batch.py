@@ -0,0 +1,96 @@
+"""
+Vectorized scoring of many candidate games at once.
+
+A batch of N games with `num_words` words of length `word_length` is
+an (N, num_words, word_length) uint8 array of letter codes (0 for 'a',
+..., 25 for 'z'), and the dictionary is an (M, word_length) array of
+the same codes (read straight out of the compiled word index).
+"""
+
+from __future__ import annotations
+
+from typing import NamedTuple, Sequence
+
+import numpy as np
+
+from typeshift.words import COMMON_WORD_FILE, word_index
+
+# how many (game, word, position) cells to look at at once when counting valid words
+CHUNK_CELLS = 1 << 23
+
+
+def encode_words(words: Sequence[str]) -> np.ndarray:
+    """
+    An (M, word_length) array of letter codes
+    """
+    data = ''.join(words).encode('ascii')
+    word_length = len(words[0]) if words else 0
+    return (np.frombuffer(data, dtype=np.uint8) - ord('a')).reshape(len(words), word_length)
+
+
+def encode_games(games: Sequence[Sequence[str]]) -> np.ndarray:
+    """
+    An (N, num_words, word_length) array of letter codes
+    """
+    num_words = len(games[0]) if games else 0
+    encoded = encode_words([word for game in games for word in game])
+    return encoded.reshape(len(games), num_words, encoded.shape[1])
+
+
+def word_matrix(word_length: int, word_file: str = COMMON_WORD_FILE) -> np.ndarray:
+    """
+    The (M, word_length) array of letter codes for the words in the index
+    """
+    blob = np.frombuffer(word_index(word_file).words_blob(word_length), dtype=np.uint8)
+    return (blob - ord('a')).reshape(-1, word_length)
+
+
+def popcount32(masks: np.ndarray) -> np.ndarray:
+    """
+    The number of set bits in each element of a uint32 array
+    """
+    as_bytes = np.ascontiguousarray(masks, dtype=np.uint32).view(np.uint8)
+    return np.unpackbits(as_bytes.reshape(*masks.shape, 4), axis=-1).sum(axis=-1)
+
+
+class BatchScores(NamedTuple):
+    # (N, word_length) uint32 letter mask for each column
+    masks: np.ndarray
+    # (N,) whether each game uses each letter at most once per column
+    parsimonious: np.ndarray
+    # (N,) how many dictionary words fit each game
+    num_valid: np.ndarray
+    # (N,) how many letters each game repeats within a column
+    excess_chars: np.ndarray
+
+
+def score_games(games: np.ndarray, valid_words: np.ndarray) -> BatchScores:
+    """
+    Scores every game in the batch against the dictionary
+    """
+    num_games, num_words, word_length = games.shape
+
+    masks = np.bitwise_or.reduce(np.left_shift(np.uint32(1), games.astype(np.uint32)), axis=1)
+    excess_chars = num_words * word_length - popcount32(masks).sum(axis=1)
+
+    # allowed[n, p, c] is whether game n has letter c in column p
+    letters = np.arange(26, dtype=np.uint32)
+    allowed = (masks[:, :, None] >> letters) & 1 == 1
+
+    positions = np.arange(word_length)
+    chunk = max(1, CHUNK_CELLS // max(1, len(valid_words) * word_length))
+    num_valid = np.zeros(num_games, dtype=np.int64)
+
+    for start in range(0, num_games, chunk):
+        # fits[n, m, p] is whether word m's p-th letter is in game n's p-th column
+        fits = allowed[start:start + chunk][:, positions, valid_words]
+        num_valid[start:start + chunk] = fits.all(axis=2).sum(axis=1)
+
+    return BatchScores(masks, excess_chars == 0, num_valid, excess_chars)
+
+
+def rank_games(scores: BatchScores) -> np.ndarray:
+    """
+    The indices of the games, parsimonious ones first, then by most valid words
+    """
+    return np.lexsort((-scores.num_valid, ~scores.parsimonious))
@@ -0,0 +1,261 @@
+"""
+A reproducible benchmark suite for the solvers.
+
+    python -m typeshift.benchmarks run results.json
+    python -m typeshift.benchmarks run results.json --lengths 4 5 --seeds 3 4 5 --repeat 5
+    python -m typeshift.benchmarks compare old.json new.json
+
+The puzzles come from a fixed seed, so two runs (on two versions of
+the code) time exactly the same games. Each case runs in its own process,
+which does `--warmup` untimed runs, then `--repeat` timed ones, and then
+one more under tracemalloc for the peak memory; if all of that takes more
+than `--timeout` seconds the case gets killed and marked as a timeout.
+
+Once a solver times out at some number of seed words, the larger
+puzzles of that length are skipped for it.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+import argparse
+import datetime
+import json
+import multiprocessing
+import platform
+import random
+import statistics
+import time
+import tracemalloc
+
+from typeshift.words import words_of_length
+from typeshift import talk1, talk2, talk3
+from typeshift.talk4 import maximal_puzzle
+from typeshift.talk5 import most_satisfying
+
+
+def brute_force(game: List[str]) -> List[str]:
+    return talk1.Spec.from_words(game).brute_force()
+
+
+def exact(game: List[str]) -> List[str]:
+    return talk2.Spec.from_words(game).minimal_solution('exact')
+
+
+def astar(game: List[str]) -> List[str]:
+    return talk3.Spec.from_words(game).minimal_solution('astar')
+
+
+# the solvers that take a game
+GAME_SOLVERS: Dict[str, Callable[[List[str]], Any]] = {
+    'brute_force': brute_force,
+    'solve1': talk1.solve1,
+    'solve2': talk2.solve2,
+    'solve3': talk3.solve3,
+    'exact': exact,
+    'astar': astar,
+}
+
+# and the ones that search over all the games
+SEARCHES: Dict[str, Callable[..., Any]] = {
+    'maximal_puzzle': maximal_puzzle,
+    'most_satisfying': most_satisfying,
+}
+
+SOLVERS = {**GAME_SOLVERS, **SEARCHES}
+
+MAXIMAL_LENGTHS = [8, 9, 10]
+MOST_SATISFYING_SIZES = [(3, 2), (3, 3), (4, 2), (4, 3)]
+
+
+class Case(NamedTuple):
+    solver: str
+    word_length: int
+    num_words: int
+    # the game for GAME_SOLVERS, otherwise the search's arguments
+    args: Tuple
+
+
+def puzzle(word_length: int, num_words: int, seed: int = 0) -> List[str]:
+    """
+    The (fixed) benchmark game for this word length and number of seed words
+    """
+    rng = random.Random(f"{seed}/{word_length}/{num_words}")
+    return sorted(rng.sample(words_of_length(word_length), num_words))
+
+
+def run_case(case: Case, warmup: int, repeat: int, results: multiprocessing.Queue) -> None:
+    solver = SOLVERS[case.solver]
+
+    for _ in range(warmup):
+        solver(*case.args)
+
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = solver(*case.args)
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    solver(*case.args)
+    _, memory_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    size = len(result) if isinstance(result, list) else None
+    results.put((times, memory_peak, size))
+
+
+def time_case(case: Case, warmup: int, repeat: int, timeout: float) -> Dict[str, Any]:
+    results: multiprocessing.Queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=run_case, args=(case, warmup, repeat, results))
+    process.start()
+    process.join(timeout)
+
+    record: Dict[str, Any] = {
+        'solver': case.solver,
+        'word_length': case.word_length,
+        'num_words': case.num_words,
+        'game': case.args[0] if case.solver in GAME_SOLVERS else None,
+    }
+
+    if process.is_alive():
+        process.terminate()
+        process.join()
+        return {**record, 'status': 'timeout'}
+    elif process.exitcode != 0:
+        return {**record, 'status': 'error'}
+
+    times, memory_peak, size = results.get()
+    median = statistics.median(times)
+    return {
+        **record,
+        'status': 'ok',
+        'times': times,
+        'median': median,
+        'min': min(times),
+        'throughput': 1 / median if median else None,
+        'memory_peak': memory_peak,
+        'result_size': size,
+    }
+
+
+def cases(solvers: Iterable[str], lengths: Sequence[int], seeds: Sequence[int], seed: int = 0) -> List[Case]:
+    result = []
+    for solver in solvers:
+        if solver in GAME_SOLVERS:
+            result.extend(Case(solver, word_length, num_words, (puzzle(word_length, num_words, seed),))
+                          for word_length in lengths
+                          for num_words in seeds)
+        elif solver == 'maximal_puzzle':
+            result.extend(Case(solver, word_length, 0, (word_length,)) for word_length in MAXIMAL_LENGTHS)
+        elif solver == 'most_satisfying':
+            result.extend(Case(solver, word_length, num_words, (word_length, num_words))
+                          for word_length, num_words in MOST_SATISFYING_SIZES)
+        else:
+            raise ValueError(f"unknown solver: {solver}")
+    return result
+
+
+def run(solvers: Iterable[str] = SOLVERS,
+        lengths: Sequence[int] = range(3, 11),
+        seeds: Sequence[int] = range(3, 14),
+        seed: int = 0,
+        warmup: int = 1,
+        repeat: int = 3,
+        timeout: float = 30,
+        log: Optional[Callable[[str], None]] = print) -> Dict[str, Any]:
+    """
+    Runs the suite and returns the results (as something JSON-able)
+    """
+    records = []
+    # the (solver, word length)s that have already timed out
+    too_slow = set()
+
+    for case in cases(solvers, lengths, seeds, seed):
+        if (case.solver, case.word_length) in too_slow:
+            record = {**case._asdict(), 'status': 'skipped'}
+            del record['args']
+        else:
+            record = time_case(case, warmup, repeat, timeout)
+            if record['status'] == 'timeout' and case.solver in GAME_SOLVERS:
+                too_slow.add((case.solver, case.word_length))
+
+        records.append(record)
+        if log is not None:
+            log(summary(record))
+
+    return {
+        'meta': {
+            'date': datetime.datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'seed': seed,
+            'warmup': warmup,
+            'repeat': repeat,
+            'timeout': timeout,
+        },
+        'results': records,
+    }
+
+
+def summary(record: Dict[str, Any]) -> str:
+    name = f"{record['solver']:16} {record['word_length']:2} {record['num_words']:2}"
+    if record['status'] != 'ok':
+        return f"{name}  {record['status']}"
+    return f"{name}  {record['median'] * 1000:10.2f}ms  {record['memory_peak'] / 1024:10.0f}KiB"
+
+
+def compare(old: Dict[str, Any], new: Dict[str, Any], threshold: float = 1.2) -> List[str]:
+    """
+    The cases that got more than `threshold` times slower (or stopped finishing)
+    """
+    def key(record: Dict[str, Any]) -> Tuple:
+        return record['solver'], record['word_length'], record['num_words']
+
+    old_records = {key(record): record for record in old['results']}
+    regressions = []
+
+    for record in new['results']:
+        before = old_records.get(key(record))
+        if before is None or before['status'] != 'ok':
+            continue
+        if record['status'] != 'ok' or record['median'] > threshold * before['median']:
+            regressions.append(f"{summary(record)}  (was {before['median'] * 1000:.2f}ms)")
+
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run')
+    run_parser.add_argument('output')
+    run_parser.add_argument('--solvers', nargs='+', default=list(SOLVERS), choices=list(SOLVERS))
+    run_parser.add_argument('--lengths', nargs='+', type=int, default=list(range(3, 11)))
+    run_parser.add_argument('--seeds', nargs='+', type=int, default=list(range(3, 14)))
+    run_parser.add_argument('--seed', type=int, default=0)
+    run_parser.add_argument('--warmup', type=int, default=1)
+    run_parser.add_argument('--repeat', type=int, default=3)
+    run_parser.add_argument('--timeout', type=float, default=30)
+
+    compare_parser = subparsers.add_parser('compare')
+    compare_parser.add_argument('old')
+    compare_parser.add_argument('new')
+    compare_parser.add_argument('--threshold', type=float, default=1.2)
+
+    args = parser.parse_args()
+
+    if args.command == 'run':
+        results = run(args.solvers, args.lengths, args.seeds, args.seed, args.warmup, args.repeat, args.timeout)
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    else:
+        with open(args.old) as f:
+            old = json.load(f)
+        with open(args.new) as f:
+            new = json.load(f)
+        regressions = compare(old, new, args.threshold)
+        for regression in regressions:
+            print(regression)
+        raise SystemExit(1 if regressions else 0)
@@ -0,0 +1,203 @@
+"""
+A precomputed catalog of games, stored in SQLite, so that serving
+a game is a lookup rather than a search.
+
+    python typeshift/catalog.py build data/catalog.db 1000 4 5 6
+    python typeshift/catalog.py sample data/catalog.db 5
+    python typeshift/catalog.py sample data/catalog.db 5 4
+
+Each game is stored along with its packed constraints, the size of its
+minimal solution, how many valid words fit it, and whether it's parsimonious.
+Its difficulty comes from its decoys, the valid words that fit it other than
+its seed words: the more there are, the harder the seed words are to pick out.
+(The size of the minimal solution won't do, since for the parsimonious games
+`greedy_puzzle` makes it's always just the number of seed words.) It's the
+number of binary digits in the number of decoys, so 0 for none, 1 for one,
+2 for 2-3, 3 for 4-7, and so on. Within each (word length, difficulty) bucket
+the games are numbered 0, 1, 2, ..., so sampling one is a random number and
+an indexed lookup.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple
+import multiprocessing
+import random
+import sqlite3
+import threading
+
+from typeshift.words import COMMON_WORD_FILE, word_index
+from typeshift.constraints import Packed, mask2chars, packed_words, popcount, seed2packed, unpack
+from typeshift.cover import minimum_cover
+from typeshift.talk4 import greedy_puzzle
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    words TEXT NOT NULL UNIQUE,
+    word_length INTEGER NOT NULL,
+    num_words INTEGER NOT NULL,
+    spec BLOB NOT NULL,
+    minimal_size INTEGER NOT NULL,
+    num_valid INTEGER NOT NULL,
+    parsimonious INTEGER NOT NULL,
+    difficulty INTEGER NOT NULL,
+    seq INTEGER NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS games_by_bucket ON games (word_length, difficulty, seq);
+CREATE TABLE IF NOT EXISTS buckets (
+    word_length INTEGER NOT NULL,
+    difficulty INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (word_length, difficulty)
+);
+"""
+
+
+class Entry(NamedTuple):
+    words: List[str]
+    spec: Packed
+    minimal_size: int
+    num_valid: int
+    parsimonious: bool
+
+    @property
+    def word_length(self) -> int:
+        return len(self.words[0])
+
+    @property
+    def decoys(self) -> int:
+        return self.num_valid - len(self.words)
+
+    @property
+    def difficulty(self) -> int:
+        return self.decoys.bit_length()
+
+
+def spec_bytes(spec: Packed, word_length: int) -> bytes:
+    return spec.to_bytes((26 * word_length + 7) // 8, 'little')
+
+
+def score_game(words: List[str], word_file: str = COMMON_WORD_FILE) -> Entry:
+    """
+    Everything the catalog stores about a game
+    """
+    words = sorted(words)
+    spec = seed2packed(words)
+    charses = [mask2chars(mask) for mask in unpack(spec, len(words[0]))]
+    candidates = word_index(word_file).matching(charses)
+    minimal = minimum_cover(packed_words(candidates), spec)
+    parsimonious = popcount(spec) == sum(len(word) for word in words)
+    return Entry(words, spec, len(minimal), len(candidates), parsimonious)
+
+
+def generate_task(args: Tuple[int, int, str]) -> Entry:
+    word_length, niter, word_file = args
+    return score_game(greedy_puzzle(word_length, niter), word_file)
+
+
+def generate(word_length: int, count: int, niter: int = 1,
+             processes: int = 1, word_file: str = COMMON_WORD_FILE) -> Iterator[Entry]:
+    """
+    Generates and scores `count` games (streaming them back as they're done)
+    """
+    tasks = [(word_length, niter, word_file)] * count
+
+    if processes <= 1:
+        yield from map(generate_task, tasks)
+        return
+
+    with multiprocessing.Pool(processes) as pool:
+        yield from pool.imap_unordered(generate_task, tasks, chunksize=16)
+
+
+class Catalog:
+    def __init__(self, path: str) -> None:
+        # the app shares one catalog across its script threads
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.executescript(SCHEMA)
+        self.lock = threading.Lock()
+
+    def add(self, entries: Iterable[Entry]) -> int:
+        """
+        Adds the games (skipping any that are already there),
+        and returns how many were new
+        """
+        added = 0
+        with self.lock, self.connection:
+            for entry in entries:
+                words = ' '.join(entry.words)
+                if self.connection.execute("SELECT 1 FROM games WHERE words = ?", (words,)).fetchone():
+                    continue
+
+                bucket = (entry.word_length, entry.difficulty)
+                self.connection.execute(
+                    "INSERT OR IGNORE INTO buckets (word_length, difficulty, count) VALUES (?, ?, 0)", bucket)
+                seq, = self.connection.execute(
+                    "SELECT count FROM buckets WHERE word_length = ? AND difficulty = ?", bucket).fetchone()
+
+                self.connection.execute(
+                    "INSERT INTO games (words, word_length, num_words, spec, minimal_size, num_valid,"
+                    " parsimonious, difficulty, seq) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (words, entry.word_length, len(entry.words), spec_bytes(entry.spec, entry.word_length),
+                     entry.minimal_size, entry.num_valid, entry.parsimonious, entry.difficulty, seq))
+                self.connection.execute(
+                    "UPDATE buckets SET count = count + 1 WHERE word_length = ? AND difficulty = ?", bucket)
+                added += 1
+
+        return added
+
+    def counts(self, word_length: int) -> List[Tuple[int, int]]:
+        """
+        The (difficulty, number of games) buckets for the given word length
+        """
+        with self.lock:
+            return self.connection.execute(
+                "SELECT difficulty, count FROM buckets WHERE word_length = ? ORDER BY difficulty",
+                (word_length,)).fetchall()
+
+    def sample(self, word_length: int, difficulty: Optional[int] = None,
+               rng: Optional[random.Random] = None) -> Optional[Entry]:
+        """
+        A random game of the given length (and difficulty), or None if there aren't any
+        """
+        buckets = [(d, count) for d, count in self.counts(word_length)
+                   if count and (difficulty is None or d == difficulty)]
+        if not buckets:
+            return None
+
+        # pick a bucket in proportion to its size, and then a game in it
+        k = (rng or random).randrange(sum(count for _, count in buckets))
+        for d, count in buckets:
+            if k < count:
+                break
+            k -= count
+
+        with self.lock:
+            words, spec, minimal_size, num_valid, parsimonious = self.connection.execute(
+                "SELECT words, spec, minimal_size, num_valid, parsimonious FROM games"
+                " WHERE word_length = ? AND difficulty = ? AND seq = ?", (word_length, d, k)).fetchone()
+
+        return Entry(words.split(), int.from_bytes(spec, 'little'), minimal_size, num_valid, bool(parsimonious))
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+if __name__ == "__main__":
+    import sys
+
+    command, path = sys.argv[1:3]
+    catalog = Catalog(path)
+
+    if command == 'build':
+        count = int(sys.argv[3])
+        for word_length in map(int, sys.argv[4:]):
+            added = catalog.add(generate(word_length, count, processes=multiprocessing.cpu_count()))
+            print(word_length, "added", added, "games:", catalog.counts(word_length))
+    elif command == 'sample':
+        word_length = int(sys.argv[3])
+        difficulty = int(sys.argv[4]) if len(sys.argv) > 4 else None
+        print(catalog.sample(word_length, difficulty))
+    else:
+        raise ValueError(f"unknown command: {command}")
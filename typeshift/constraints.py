@@ -0,0 +1,152 @@
+"""
+A shared constraint engine that uses plain Python ints as bitmasks.
+
+A single constraint is a 26-bit int (bit i is set if the i-th letter
+is allowed), and a whole puzzle is "packed" into one int with 26 bits
+per position. That way applying a word, checking a word for conflicts,
+and checking whether a puzzle is solved are each a single int operation,
+nothing gets allocated in the hot loops beyond the resulting int,
+and puzzle states are hashable.
+
+The NEAT WORD GAME puzzle
+
+G
+W O   E
+N E A T
+  A M D
+    R
+
+is the tuple of masks (G|W|N, O|E|A, A|M|R, E|T|D), which packs to
+
+    (G|W|N) | (O|E|A) << 26 | (A|M|R) << 52 | (E|T|D) << 78
+"""
+
+from __future__ import annotations
+
+from typing import Iterable, List, Sequence, Tuple
+from string import ascii_lowercase
+
+from bitarray import bitarray
+
+# 26 bits, one per letter
+Mask = int
+
+# 26 bits per position
+Packed = int
+
+NUM_LETTERS = 26
+ALL_LETTERS: Mask = (1 << NUM_LETTERS) - 1
+
+c2m = {
+    c: 1 << i
+    for i, c in enumerate(ascii_lowercase)
+}
+
+
+if hasattr(int, 'bit_count'):
+    # python 3.10+
+    popcount = int.bit_count
+else:
+    def popcount(x: int) -> int:
+        return bin(x).count('1')
+
+
+def bits(x: int) -> List[int]:
+    """
+    The positions of the set bits of x
+    """
+    result = []
+    while x:
+        low = x & -x
+        result.append(low.bit_length() - 1)
+        x ^= low
+    return result
+
+
+def chars2mask(chars: Iterable[str]) -> Mask:
+    mask = 0
+    for c in chars:
+        mask |= c2m[c]
+    return mask
+
+
+def mask2chars(mask: Mask) -> List[str]:
+    return [c for i, c in enumerate(ascii_lowercase) if mask >> i & 1]
+
+
+def pack(masks: Iterable[Mask]) -> Packed:
+    packed = 0
+    for i, mask in enumerate(masks):
+        packed |= mask << (NUM_LETTERS * i)
+    return packed
+
+
+def column(packed: Packed, i: int) -> Mask:
+    return (packed >> (NUM_LETTERS * i)) & ALL_LETTERS
+
+
+def unpack(packed: Packed, word_length: int) -> Tuple[Mask, ...]:
+    return tuple(column(packed, i) for i in range(word_length))
+
+
+def word2packed(word: str) -> Packed:
+    """
+    The packed mask for a single word, with one bit set per position
+    """
+    return pack(c2m[c] for c in word)
+
+
+def packed_words(words: Iterable[str]) -> List[Packed]:
+    return [word2packed(word) for word in words]
+
+
+def seed2packed(seed_words: Iterable[str]) -> Packed:
+    """
+    The packed constraints for a puzzle made from the given seed words
+    """
+    packed = 0
+    for word in seed_words:
+        packed |= word2packed(word)
+    return packed
+
+
+def apply(word: Packed, puzzle: Packed) -> Packed:
+    """
+    Removes all the constraints that are satisfied by the word
+    """
+    return puzzle & ~word
+
+
+def conflicts(word: Packed, puzzle: Packed) -> bool:
+    """
+    Does the word use any of the (position, letter) pairs in the puzzle?
+    """
+    return word & puzzle != 0
+
+
+def words_needed(puzzle: Packed, word_length: int) -> int:
+    """
+    A lower bound on how many words it takes to satisfy the puzzle:
+    the most letters left in any one column (each word only uses one)
+    """
+    return max((popcount(column(puzzle, i)) for i in range(word_length)), default=0)
+
+
+def from_bitarray(constraint: bitarray) -> Mask:
+    return sum(1 << i for i, b in enumerate(constraint) if b)
+
+
+def to_bitarray(mask: Mask) -> bitarray:
+    return bitarray([bool(mask >> i & 1) for i in range(NUM_LETTERS)])
+
+
+def from_bitarrays(constraints: Sequence[bitarray]) -> Packed:
+    return pack(from_bitarray(constraint) for constraint in constraints)
+
+
+def from_char_lists(constraints: Sequence[Iterable[str]]) -> Packed:
+    return pack(chars2mask(chars) for chars in constraints)
+
+
+def to_bitarrays(packed: Packed, word_length: int) -> List[bitarray]:
+    return [to_bitarray(mask) for mask in unpack(packed, word_length)]
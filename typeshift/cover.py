@@ -0,0 +1,184 @@
+"""
+An exact solver for the "minimal solution" problem,
+framed as a set cover problem over (position, letter) pairs.
+
+Every candidate word covers the (position, letter) pairs it uses,
+and we want the fewest candidates whose union covers the whole puzzle.
+Both the candidates and the puzzle are packed ints (see `typeshift.constraints`),
+so a candidate covers exactly the bits of `candidate & puzzle`.
+
+The search is a branch-and-bound that always branches on the
+uncovered pair with the fewest candidates that cover it, and prunes with
+a lower bound: a set of uncovered pairs no two of which can be covered
+by the same candidate (for example, all the pairs in one column)
+needs at least that many more words.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Iterator, List, Optional, Sequence
+import time
+
+from typeshift.constraints import Packed, bits, popcount
+from typeshift.stats import SearchStats
+
+
+def remove_dominated(covers: Sequence[Packed], puzzle: Packed) -> List[int]:
+    """
+    Returns the indices of the covers that are worth searching over:
+    a cover that only covers a subset of what some other cover covers
+    can always be swapped for that other cover, so it can never be needed.
+    (Of several identical covers we keep the first.)
+    """
+    useful = [i for i, cover in enumerate(covers) if cover & puzzle]
+    useful.sort(key=lambda i: -popcount(covers[i] & puzzle))
+
+    kept: List[int] = []
+    for i in useful:
+        cover = covers[i] & puzzle
+        if not any(cover & ~(covers[j] & puzzle) == 0 for j in kept):
+            kept.append(i)
+
+    return sorted(kept)
+
+
+def covering_sets(masks: Sequence[Packed], puzzle: Packed) -> Dict[int, int]:
+    """
+    For each (position, letter) bit of the puzzle, the bitset of the masks that cover it
+    """
+    covered_by: Dict[int, int] = {bit: 0 for bit in bits(puzzle)}
+    for c, mask in enumerate(masks):
+        for bit in bits(mask & puzzle):
+            covered_by[bit] |= 1 << c
+    return covered_by
+
+
+def lower_bound(residual: Packed, excluded: int, covered_by: Dict[int, int]) -> int:
+    """
+    Greedily collect uncovered bits whose (non-excluded) covers are pairwise
+    disjoint; each of them needs its own word.
+    """
+    used, count = 0, 0
+    for bit in sorted(bits(residual), key=lambda bit: popcount(covered_by[bit] & ~excluded)):
+        available = covered_by[bit] & ~excluded
+        if not available & used:
+            used |= available
+            count += 1
+    return count
+
+
+def minimum_cover(covers: Sequence[Packed], puzzle: Packed, stats: Optional[SearchStats] = None,
+                  deadline: Optional[float] = None) -> List[int]:
+    """
+    Returns the (sorted) indices of a minimum-size subset of the covers
+    whose union covers the puzzle, or [] if there isn't one.
+    Raises TimeoutError if it's still searching at `deadline` (a `time.monotonic()` time).
+    """
+    if not puzzle:
+        return []
+
+    candidates = remove_dominated(covers, puzzle)
+    masks = [covers[i] & puzzle for i in candidates]
+    covered_by = covering_sets(masks, puzzle)
+
+    if not all(covered_by.values()):
+        return []
+
+    def greedy(residual: Packed) -> List[int]:
+        chosen = []
+        while residual:
+            c = max(range(len(masks)), key=lambda c: popcount(masks[c] & residual))
+            chosen.append(c)
+            residual &= ~masks[c]
+        return chosen
+
+    best = greedy(puzzle)
+    chosen: List[int] = []
+
+    def search(residual: Packed, excluded: int) -> None:
+        nonlocal best
+
+        if deadline is not None and time.monotonic() > deadline:
+            raise TimeoutError("no minimum cover found before the deadline")
+
+        if stats is not None:
+            stats.expand(len(chosen))
+
+        if not residual:
+            if len(chosen) < len(best):
+                best = chosen[:]
+                if stats is not None:
+                    stats.improve(len(best))
+            return
+
+        if len(chosen) + lower_bound(residual, excluded, covered_by) >= len(best):
+            if stats is not None:
+                stats.prune('bound')
+            return
+
+        # branch on the uncovered bit with the fewest remaining options
+        bit = min(bits(residual), key=lambda bit: popcount(covered_by[bit] & ~excluded))
+        options = bits(covered_by[bit] & ~excluded)
+        options.sort(key=lambda c: -popcount(masks[c] & residual))
+
+        for c in options:
+            chosen.append(c)
+            search(residual & ~masks[c], excluded)
+            chosen.pop()
+            # every cover that uses c has now been considered
+            excluded |= 1 << c
+
+    search(puzzle, 0)
+
+    return sorted(candidates[c] for c in best)
+
+
+def iter_minimum_covers(covers: Sequence[Packed], puzzle: Packed,
+                        limit: Optional[int] = None,
+                        timeout: Optional[float] = None) -> Iterator[List[int]]:
+    """
+    Yields the (sorted) indices of every minimum-size subset of the covers
+    whose union covers the puzzle, each one exactly once, as they're found.
+    Stops after `limit` of them or after `timeout` seconds, whichever comes first.
+
+    It's the same branching as `minimum_cover` (without the dominance
+    pruning, since a dominated cover can still be part of a minimum one),
+    but with the size fixed, so it only keeps the current path in memory.
+    """
+    if not puzzle or limit == 0:
+        return
+
+    deadline = None if timeout is None else time.monotonic() + timeout
+    try:
+        size = len(minimum_cover(covers, puzzle, deadline=deadline))
+    except TimeoutError:
+        return
+    if not size:
+        return
+
+    useful = [i for i, cover in enumerate(covers) if cover & puzzle]
+    masks = [covers[i] & puzzle for i in useful]
+    covered_by = covering_sets(masks, puzzle)
+    chosen: List[int] = []
+
+    def search(residual: Packed, excluded: int) -> Iterator[List[int]]:
+        if not residual:
+            yield sorted(useful[c] for c in chosen)
+            return
+
+        if len(chosen) + lower_bound(residual, excluded, covered_by) > size:
+            return
+
+        bit = min(bits(residual), key=lambda bit: popcount(covered_by[bit] & ~excluded))
+        for c in bits(covered_by[bit] & ~excluded):
+            if deadline is not None and time.monotonic() > deadline:
+                return
+            chosen.append(c)
+            yield from search(residual & ~masks[c], excluded)
+            chosen.pop()
+            excluded |= 1 << c
+
+    for count, cover in enumerate(search(puzzle, 0), 1):
+        yield cover
+        if count == limit:
+            return
@@ -0,0 +1,247 @@
+"""
+A compiled, memory-mapped dictionary index.
+
+    python -m typeshift.index data/words_common.txt data/corncob.txt
+
+compiles each word list into a `.idx` file next to it, which holds,
+for each word length,
+
+* the words themselves, as fixed-width ascii
+* each word's letter mask (a uint32 with one bit per distinct letter)
+* for each (position, letter), a posting bitset over the words
+
+along with the lengths of all the words in their original order
+(so that the full word list can be put back together).
+
+Loading an index just maps the file, and each section is only decoded
+the first time it's asked for, so every process that loads the same
+index shares one copy of it through the page cache.
+
+The postings answer "which words fit these constraints" directly:
+OR together the postings for the letters in each column, and then
+AND together the columns.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Union
+from collections import defaultdict
+import mmap
+import os
+import struct
+import tempfile
+
+from typeshift.constraints import NUM_LETTERS, bits, chars2mask
+
+MAGIC = b'TSIX'
+VERSION = 2
+
+# magic, version, number of words, number of lengths, offset of the word lengths
+HEADER = struct.Struct('<4sIIIQ')
+
+# word length, number of words, offsets of the words, letter masks, and postings
+SECTION = struct.Struct('<IIQQQ')
+
+# a mapped index file or an in-memory one
+Buffer = Union[mmap.mmap, bytes]
+
+
+class Section(NamedTuple):
+    word_length: int
+    count: int
+    words_offset: int
+    masks_offset: int
+    postings_offset: int
+
+    @property
+    def posting_bytes(self) -> int:
+        return (self.count + 7) // 8
+
+
+def index_bytes(words: Sequence[str]) -> bytes:
+    """
+    The compiled index for the given words (each only once, where it first appears)
+    """
+    words = list(dict.fromkeys(words))
+    bylen: Dict[int, List[str]] = defaultdict(list)
+    for word in words:
+        bylen[len(word)].append(word)
+
+    lengths = sorted(bylen)
+    offset = HEADER.size + SECTION.size * len(lengths)
+    sections = []
+    blobs = []
+
+    for word_length in lengths:
+        length_words = bylen[word_length]
+        count = len(length_words)
+        posting_bytes = (count + 7) // 8
+
+        words_blob = ''.join(length_words).encode('ascii')
+        masks_blob = struct.pack(f'<{count}I', *(chars2mask(word) for word in length_words))
+
+        postings = [[0] * NUM_LETTERS for _ in range(word_length)]
+        for i, word in enumerate(length_words):
+            for position, c in enumerate(word):
+                postings[position][ord(c) - ord('a')] |= 1 << i
+        postings_blob = b''.join(
+            posting.to_bytes(posting_bytes, 'little')
+            for position_postings in postings
+            for posting in position_postings
+        )
+
+        words_offset = offset
+        masks_offset = words_offset + len(words_blob)
+        postings_offset = masks_offset + len(masks_blob)
+        offset = postings_offset + len(postings_blob)
+
+        sections.append(SECTION.pack(word_length, count, words_offset, masks_offset, postings_offset))
+        blobs.extend([words_blob, masks_blob, postings_blob])
+
+    header = HEADER.pack(MAGIC, VERSION, len(words), len(lengths), offset)
+    order = bytes(len(word) for word in words)
+    return b''.join([header, *sections, *blobs, order])
+
+
+def compile_index(words: Sequence[str], path: str) -> None:
+    """
+    Writes the index for the given words to `path`. It's written to a temporary
+    file and then renamed into place, so a process that has the old index mapped
+    keeps its (intact) copy, and one that loads it meanwhile never sees half of it.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(index_bytes(words))
+        # (mkstemp makes it private to us)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class WordIndex:
+    def __init__(self, buffer: Buffer) -> None:
+        self.buffer = buffer
+
+        magic, version, self.num_words, num_lengths, self.order_offset = HEADER.unpack_from(self.buffer, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"not a version {VERSION} word index")
+
+        self.sections: Dict[int, Section] = {}
+        for i in range(num_lengths):
+            section = Section(*SECTION.unpack_from(self.buffer, HEADER.size + i * SECTION.size))
+            self.sections[section.word_length] = section
+
+        # the decoded sections, kept on the index itself so that they go when it does
+        self._words: Dict[int, List[str]] = {}
+        self._all_words: Optional[List[str]] = None
+        self._postings: Dict[Tuple[int, int, str], int] = {}
+
+    @staticmethod
+    def load(path: str) -> WordIndex:
+        """
+        Maps the compiled index at `path`
+        """
+        with open(path, 'rb') as f:
+            return WordIndex(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    @staticmethod
+    def from_words(words: Iterable[str]) -> WordIndex:
+        """
+        Builds an (in-memory) index for an arbitrary collection of words
+        """
+        return WordIndex(index_bytes(sorted(words)))
+
+    def lengths(self) -> List[int]:
+        return list(self.sections)
+
+    def words(self, word_length: int) -> List[str]:
+        """
+        The words of the given length, in their original order
+        """
+        section = self.sections.get(word_length)
+        if section is None:
+            return []
+
+        if word_length not in self._words:
+            start, end = section.words_offset, section.words_offset + section.count * word_length
+            blob = self.buffer[start:end].decode('ascii')
+            self._words[word_length] = [blob[i:i + word_length] for i in range(0, len(blob), word_length)]
+        return self._words[word_length]
+
+    def words_blob(self, word_length: int) -> memoryview:
+        """
+        The words of the given length as one fixed-width ascii blob (straight out of the map)
+        """
+        section = self.sections.get(word_length)
+        if section is None:
+            return memoryview(b'')
+
+        return memoryview(self.buffer)[section.words_offset:section.words_offset + section.count * word_length]
+
+    def all_words(self) -> List[str]:
+        """
+        All the words, in their original order
+        """
+        if self._all_words is None:
+            iterators = {word_length: iter(self.words(word_length)) for word_length in self.sections}
+            order = self.buffer[self.order_offset:self.order_offset + self.num_words]
+            self._all_words = [next(iterators[word_length]) for word_length in order]
+        return self._all_words
+
+    def letter_masks(self, word_length: int) -> Sequence[int]:
+        """
+        The letter mask of each word of the given length (read straight out of the map)
+        """
+        section = self.sections.get(word_length)
+        if section is None:
+            return []
+
+        view = memoryview(self.buffer)[section.masks_offset:section.masks_offset + 4 * section.count]
+        return view.cast('I')
+
+    def posting(self, word_length: int, position: int, letter: str) -> int:
+        """
+        The bitset of the words of the given length that have `letter` in `position`
+        """
+        key = (word_length, position, letter)
+        posting = self._postings.get(key)
+        if posting is None:
+            section = self.sections.get(word_length)
+            if section is None:
+                return 0
+
+            size = section.posting_bytes
+            start = section.postings_offset + (position * NUM_LETTERS + ord(letter) - ord('a')) * size
+            posting = self._postings[key] = int.from_bytes(self.buffer[start:start + size], 'little')
+        return posting
+
+    def matching(self, charses: Sequence[Iterable[str]]) -> List[str]:
+        """
+        Returns all the words whose i-th letter is one of `charses[i]`, in alphabetical order.
+        Each column is the OR of its letters' postings, and the matches are the AND of the columns.
+        """
+        word_length = len(charses)
+        if word_length not in self.sections:
+            return []
+
+        matches = -1
+        for position, chars in enumerate(charses):
+            column = 0
+            for c in chars:
+                column |= self.posting(word_length, position, c)
+            matches &= column
+
+        length_words = self.words(word_length)
+        return sorted(length_words[i] for i in bits(matches))
+
+
+if __name__ == "__main__":
+    import sys
+    from typeshift.words import index_file, read_words
+
+    for word_file in sys.argv[1:]:
+        compile_index(read_words(word_file), index_file(word_file))
+        print("compiled", word_file, "to", index_file(word_file))
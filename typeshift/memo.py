@@ -0,0 +1,38 @@
+"""
+A bounded transposition table for the searches, which remembers the
+(hashable) states they've already reached and forgets the least
+recently seen ones once it's full.
+"""
+
+from __future__ import annotations
+
+from typing import Hashable
+from collections import OrderedDict
+
+
+class TranspositionTable:
+    def __init__(self, max_size: int = 1 << 20) -> None:
+        self.max_size = max_size
+        self.states: OrderedDict[Hashable, None] = OrderedDict()
+        self.hits = 0
+
+    def __len__(self) -> int:
+        return len(self.states)
+
+    def __contains__(self, state: Hashable) -> bool:
+        return state in self.states
+
+    def seen(self, state: Hashable) -> bool:
+        """
+        Records `state`, and returns whether it was already there
+        (in which case it becomes the most recently seen)
+        """
+        if state in self.states:
+            self.states.move_to_end(state)
+            self.hits += 1
+            return True
+
+        self.states[state] = None
+        if len(self.states) > self.max_size:
+            self.states.popitem(last=False)
+        return False
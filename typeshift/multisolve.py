@@ -0,0 +1,121 @@
+"""
+Solves a whole batch of puzzles (of the same word length) at once.
+
+Instead of looking up each puzzle's candidates separately, we flip the
+index around: for each (position, letter), the bitset of the *puzzles*
+that allow that letter there. Then one pass over the dictionary finds,
+for each word, every puzzle it fits (the AND of its letters' bitsets),
+and each puzzle's minimal solution is a set cover over its own candidates.
+"""
+
+from __future__ import annotations
+
+from typing import List, NamedTuple, Optional, Sequence
+import multiprocessing
+import re
+
+from typeshift.words import COMMON_WORD_FILE, words_of_length
+from typeshift.constraints import NUM_LETTERS, Packed, bits, column, packed_words, seed2packed
+from typeshift.cover import minimum_cover
+
+ONES = re.compile('1')
+
+
+class Solution(NamedTuple):
+    # all the valid words that fit the puzzle (in dictionary order)
+    candidates: List[str]
+    # and a minimal set of them that uses every letter
+    minimal: List[str]
+
+
+def puzzle_postings(puzzles: Sequence[Packed], word_length: int) -> List[List[int]]:
+    """
+    postings[position][letter] is the bitset of the puzzles that allow `letter` in `position`
+    """
+    # build each bitset as a string of binary digits (highest puzzle first),
+    # so that it costs O(len(puzzles)) rather than O(len(puzzles) ** 2)
+    digits = [[bytearray(b'0' * len(puzzles)) for _ in range(NUM_LETTERS)] for _ in range(word_length)]
+    last = len(puzzles) - 1
+
+    for p, puzzle in enumerate(puzzles):
+        for position in range(word_length):
+            for letter in bits(column(puzzle, position)):
+                digits[position][letter][last - p] = ord('1')
+
+    return [[int(letter_digits or b'0', 2) for letter_digits in position_digits] for position_digits in digits]
+
+
+def wide_bits(x: int) -> List[int]:
+    """
+    `bits(x)`, but faster when x is thousands of bits wide (and fairly dense),
+    since it finds the ones in x's binary digits instead of peeling off one bit at a time
+    """
+    return [match.start() for match in ONES.finditer(bin(x)[:1:-1])]
+
+
+def candidates_by_puzzle(puzzles: Sequence[Packed], words: Sequence[str]) -> List[List[int]]:
+    """
+    For each puzzle, the indices of the words that fit it, found in one pass over the words
+    """
+    word_length = len(words[0]) if words else 0
+    postings = puzzle_postings(puzzles, word_length)
+    all_puzzles = (1 << len(puzzles)) - 1
+    candidates: List[List[int]] = [[] for _ in puzzles]
+
+    for w, word in enumerate(words):
+        fits = all_puzzles
+        for position_postings, c in zip(postings, word):
+            fits &= position_postings[ord(c) - ord('a')]
+            if not fits:
+                break
+        for p in wide_bits(fits):
+            candidates[p].append(w)
+
+    return candidates
+
+
+def cover_task(args: tuple) -> List[int]:
+    covers, puzzle = args
+    return minimum_cover(covers, puzzle)
+
+
+def solve_puzzles(puzzles: Sequence[Packed],
+                  word_length: int,
+                  words: Optional[Sequence[str]] = None,
+                  processes: int = 1) -> List[Solution]:
+    """
+    The candidates and a minimal solution for each of the (packed) puzzles,
+    checked against `words` (by default all the common words of that length).
+    With processes > 1 the covers are split across a process pool.
+    """
+    if words is None:
+        words = words_of_length(word_length, COMMON_WORD_FILE)
+
+    # (a batch of generated puzzles can have repeats, which only need solving once)
+    unique = list(dict.fromkeys(puzzles))
+    word_masks = packed_words(words)
+    candidates = candidates_by_puzzle(unique, words)
+    tasks = [([word_masks[w] for w in puzzle_candidates], puzzle)
+             for puzzle_candidates, puzzle in zip(candidates, unique)]
+
+    if processes <= 1:
+        covers = list(map(cover_task, tasks))
+    else:
+        with multiprocessing.Pool(processes) as pool:
+            covers = pool.map(cover_task, tasks, chunksize=max(1, len(tasks) // (4 * processes)))
+
+    solutions = {
+        puzzle: Solution([words[w] for w in puzzle_candidates], [words[puzzle_candidates[c]] for c in cover])
+        for puzzle, puzzle_candidates, cover in zip(unique, candidates, covers)
+    }
+    return [solutions[puzzle] for puzzle in puzzles]
+
+
+def solve_games(games: Sequence[Sequence[str]],
+                words: Optional[Sequence[str]] = None,
+                processes: int = 1) -> List[Solution]:
+    """
+    `solve_puzzles` for games given as their seed words (all of the same length)
+    """
+    word_length = len(games[0][0]) if games else 0
+    return solve_puzzles([seed2packed(game) for game in games], word_length, words, processes)
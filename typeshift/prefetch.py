@@ -0,0 +1,70 @@
+"""
+Keeps a queue of ready-made games for each word length, refilled in the
+background by a process pool, so that asking for a new game doesn't
+have to wait for one to be generated.
+
+    prefetcher = GamePrefetcher(range(3, 11))
+    game = prefetcher.get(4)
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, List
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import partial
+import multiprocessing
+import queue
+import threading
+
+from typeshift.talk4 import greedy_puzzle
+
+
+class GamePrefetcher:
+    def __init__(self,
+                 word_lengths: Iterable[int],
+                 depth: int = 8,
+                 processes: int = 2,
+                 niter: int = 1) -> None:
+        self.depth = depth
+        self.niter = niter
+        # (this runs inside the multi-threaded Streamlit server, and forking a process
+        # with other threads running can deadlock the child, so the workers come from a forkserver)
+        self.executor = ProcessPoolExecutor(processes, mp_context=multiprocessing.get_context('forkserver'))
+        self.games: Dict[int, queue.Queue] = {word_length: queue.Queue() for word_length in word_lengths}
+        self.pending = {word_length: 0 for word_length in self.games}
+        # reentrant, since a future that's already done runs its callback right away
+        self.lock = threading.RLock()
+
+        for word_length in self.games:
+            self.refill(word_length)
+
+    def refill(self, word_length: int) -> None:
+        """
+        Asks the pool for enough games to bring the queue back up to `depth`
+        """
+        with self.lock:
+            while self.games[word_length].qsize() + self.pending[word_length] < self.depth:
+                self.pending[word_length] += 1
+                future = self.executor.submit(greedy_puzzle, word_length, self.niter)
+                future.add_done_callback(partial(self.finished, word_length))
+
+    def finished(self, word_length: int, future: Future) -> None:
+        with self.lock:
+            self.pending[word_length] -= 1
+            if not future.cancelled() and future.exception() is None:
+                self.games[word_length].put(future.result())
+
+    def get(self, word_length: int) -> List[str]:
+        """
+        A ready-made game if there is one, otherwise one generated on the spot
+        """
+        try:
+            game = self.games[word_length].get_nowait()
+        except queue.Empty:
+            game = greedy_puzzle(word_length, self.niter)
+
+        self.refill(word_length)
+        return game
+
+    def close(self) -> None:
+        self.executor.shutdown()
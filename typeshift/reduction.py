@@ -0,0 +1,202 @@
+"""
+Shrinks the word sets the solvers search over, before they start.
+
+For the "minimal solution" (set cover) solvers, `reduce_cover` repeats,
+until nothing changes:
+
+    forcing      a (position, letter) that only one candidate covers
+                 means that candidate is in every solution, so take it
+    equivalence  candidates that cover exactly the same part of what's
+                 left are interchangeable, so keep one of each class
+    dominance    a candidate that covers a strict subset of what another
+                 covers can always be swapped for it, so drop it
+    implication  if every candidate that covers pair p also covers pair q,
+                 then covering p covers q, so q can be dropped
+
+The solvers search the reduced problem (one representative per class)
+and `Reduction.expand` turns their answer back into candidate indices.
+
+For the searches over parsimonious games, `dominant_words` drops every
+word whose conflicts include all of another word's conflicts: any game
+with it can swap it for the other word, which is at least as good for
+finding a largest game.
+"""
+
+from __future__ import annotations
+
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+from typeshift.constraints import Packed, bits, popcount
+from typeshift.stats import SearchStats, phase
+
+
+class Reduction(NamedTuple):
+    # the candidates (or rather, one from each class) that are in every minimal solution
+    forced: List[int]
+    # the interchangeable candidates, each class with its representative first
+    classes: List[List[int]]
+    # what each class covers of the residual
+    masks: List[Packed]
+    # what's left to cover after the forced candidates
+    # (and with the implied pairs dropped)
+    residual: Packed
+    # False if some pair can't be covered at all
+    feasible: bool
+
+    def representatives(self) -> List[int]:
+        return [members[0] for members in self.classes]
+
+    def expand(self, chosen: Iterable[int]) -> List[int]:
+        """
+        The (sorted) candidate indices for the forced candidates
+        plus the chosen classes (by their position in `classes`)
+        """
+        return sorted(self.forced + [self.classes[c][0] for c in chosen])
+
+
+def covering_bitsets(masks: Dict[int, Packed], residual: Packed) -> Dict[int, int]:
+    """
+    For each bit of the residual, the bitset of the (keys of the) masks that cover it
+    """
+    covered_by = {bit: 0 for bit in bits(residual)}
+    for i, mask in masks.items():
+        for bit in bits(mask & residual):
+            covered_by[bit] |= 1 << i
+    return covered_by
+
+
+def reduce_cover(covers: Sequence[Packed], puzzle: Packed, stats: Optional[SearchStats] = None) -> Reduction:
+    """
+    Reduces the problem of covering `puzzle` with the fewest `covers`
+    (see the module docstring), without changing the size of its minimal solutions
+    """
+    residual = puzzle
+    forced: List[int] = []
+    # each class's members, keyed by its representative
+    classes: Dict[int, List[int]] = {}
+    masks: Dict[int, Packed] = {}
+
+    for i, cover in enumerate(covers):
+        if cover & puzzle:
+            classes[i] = [i]
+            masks[i] = cover & puzzle
+
+    while True:
+        covered_by = covering_bitsets(masks, residual)
+        if not all(covered_by.values()):
+            return Reduction(forced, [], [], residual, False)
+
+        # forcing
+        only = {covered.bit_length() - 1 for covered in covered_by.values() if popcount(covered) == 1}
+        if only:
+            for i in sorted(only):
+                residual &= ~masks[i]
+                forced.append(i)
+                del masks[i], classes[i]
+                if stats is not None:
+                    stats.prune('forced')
+            masks = {i: mask & residual for i, mask in masks.items() if mask & residual}
+            classes = {i: classes[i] for i in masks}
+            continue
+
+        # equivalence
+        by_mask: Dict[Packed, int] = {}
+        for i in list(masks):
+            rep = by_mask.setdefault(masks[i], i)
+            if rep != i:
+                classes[rep].extend(classes.pop(i))
+                del masks[i]
+                if stats is not None:
+                    stats.prune('equivalent')
+
+        # dominance: the candidates that cover everything i does are the AND
+        # of i's bits' covering bitsets, and (now that the classes are merged)
+        # any other one there covers strictly more
+        covered_by = covering_bitsets(masks, residual)
+        dominated = []
+        for i, mask in masks.items():
+            supersets = -1
+            for bit in bits(mask):
+                supersets &= covered_by[bit]
+            if supersets & ~(1 << i):
+                dominated.append(i)
+        for i in dominated:
+            del masks[i], classes[i]
+            if stats is not None:
+                stats.prune('dominated')
+
+        # implication (of equal covering bitsets, the lowest bit implies the rest)
+        covered_by = covering_bitsets(masks, residual)
+        implied = 0
+        for q, covered_q in covered_by.items():
+            for p, covered_p in covered_by.items():
+                if p != q and not covered_p & ~covered_q and (covered_p != covered_q or p < q):
+                    implied |= 1 << q
+                    if stats is not None:
+                        stats.prune('implied')
+                    break
+
+        if not dominated and not implied:
+            break
+
+        residual &= ~implied
+        masks = {i: mask & residual for i, mask in masks.items()}
+
+    # in (representative) index order, which is the order the solvers branch in
+    reps = sorted(masks)
+    return Reduction(forced, [classes[i] for i in reps], [masks[i] for i in reps], residual, True)
+
+
+def solve_reduced(words: Sequence[str],
+                  covers: Sequence[Packed],
+                  puzzle: Packed,
+                  solve: Callable[[List[str], List[Packed], Packed], List[str]],
+                  stats: Optional[SearchStats] = None) -> List[str]:
+    """
+    Reduces the problem of covering `puzzle` with the fewest of the `words`
+    (whose masks are `covers`), solves what's left with `solve(words, masks, residual)`,
+    and returns the solution in terms of the original words
+    """
+    with phase(stats, 'reduce'):
+        reduction = reduce_cover(covers, puzzle, stats)
+    if not reduction.feasible:
+        return []
+
+    chosen: List[int] = []
+    if reduction.residual:
+        rep_words = [words[i] for i in reduction.representatives()]
+        positions = {word: c for c, word in enumerate(rep_words)}
+        with phase(stats, 'search'):
+            solution = solve(rep_words, reduction.masks, reduction.residual)
+        if not solution:
+            return []
+        chosen = [positions[word] for word in solution]
+
+    return [words[i] for i in reduction.expand(chosen)]
+
+
+def dominant_words(postings: Sequence[Sequence[int]], conflicts: Sequence[int]) -> int:
+    """
+    The bitset of the words worth searching over for a largest parsimonious game,
+    given the (nonempty) postings in each position and each word's conflicts (the
+    bitset of the words it shares a letter with in some position, itself included).
+    If word a's conflicts are a subset of word b's, then a fits alongside everything
+    b does, so b is dropped. (Of words with the same conflicts, the lowest is kept.)
+    """
+    dominant = (1 << len(conflicts)) - 1
+    for b, conflicts_b in enumerate(conflicts):
+        # a word's conflicts are the union of its letters' postings, so the words whose
+        # conflicts are within b's are the ones whose every letter's posting is
+        dominators = -1
+        for position_postings in postings:
+            within = 0
+            for posting in position_postings:
+                if not posting & ~conflicts_b:
+                    within |= posting
+            dominators &= within
+
+        for a in bits(dominators & ~(1 << b)):
+            if conflicts[a] != conflicts_b or a < b:
+                dominant ^= 1 << b
+                break
+    return dominant
@@ -0,0 +1,278 @@
+"""
+A small JSON-over-HTTP game server, using nothing but asyncio.
+
+    python -m typeshift.server 8000
+    python -m typeshift.server 8000 corncob    # accept (and solve with) any corncob word
+
+    POST /games                  {"word_length": 5}   -> a new game
+    POST /games/<id>/guess       {"word": "bread"}    -> what's left of it
+    GET  /games/<id>/hint                             -> a word that helps
+    GET  /games/<id>/solution                         -> a minimal solution
+
+Anything CPU-heavy (making a game, solving one) runs in a process pool,
+under a timeout, so the event loop stays free for everyone else. (The
+solver checks the timeout itself, so a slow solve gives up its worker
+rather than holding onto it after its request has been answered.) Games
+live in memory and get forgotten after `ttl` seconds without being touched.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
+import asyncio
+import json
+import multiprocessing
+import secrets
+import time
+
+from typeshift.words import COMMON_WORD_FILE, dictionary_file, word_index, word_set
+from typeshift.constraints import Packed, packed_words
+from typeshift.cover import minimum_cover
+from typeshift.session import GameSession, constraint_strings
+from typeshift.talk4 import greedy_puzzle
+
+MAX_BODY = 1 << 16
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+REASONS = {200: 'OK', 201: 'Created', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+           413: 'Payload Too Large', 500: 'Internal Server Error', 504: 'Gateway Timeout'}
+
+
+def new_game(word_length: int) -> List[str]:
+    return greedy_puzzle(word_length)
+
+
+def solve(puzzle: Packed, word_length: int, word_file: str = COMMON_WORD_FILE,
+          timeout: Optional[float] = None) -> List[str]:
+    """
+    A minimal solution, or TimeoutError if finding one takes more than `timeout` seconds
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    candidates = word_index(word_file).matching(constraint_strings(puzzle, word_length))
+    return [candidates[i] for i in minimum_cover(packed_words(candidates), puzzle, deadline=deadline)]
+
+
+class GameStore:
+    """
+    The games in memory, each one forgotten `ttl` seconds after it was last used
+    """
+    def __init__(self, ttl: float = 3600, clock: Callable[[], float] = time.monotonic) -> None:
+        self.ttl = ttl
+        self.clock = clock
+        self.games: Dict[str, Tuple[float, GameSession]] = {}
+
+    def __len__(self) -> int:
+        return len(self.games)
+
+    def add(self, game: GameSession) -> str:
+        game_id = secrets.token_urlsafe(8)
+        self.games[game_id] = (self.clock() + self.ttl, game)
+        return game_id
+
+    def get(self, game_id: str) -> GameSession:
+        expires, game = self.games.get(game_id, (0.0, None))
+        if game is None or expires < self.clock():
+            self.games.pop(game_id, None)
+            raise HTTPError(404, f"no game {game_id}")
+        self.games[game_id] = (self.clock() + self.ttl, game)
+        return game
+
+    def evict(self) -> int:
+        """
+        Forgets the expired games, and returns how many there were
+        """
+        now = self.clock()
+        expired = [game_id for game_id, (expires, _) in self.games.items() if expires < now]
+        for game_id in expired:
+            del self.games[game_id]
+        return len(expired)
+
+
+class GameServer:
+    def __init__(self,
+                 processes: int = 2,
+                 timeout: float = 10,
+                 ttl: float = 3600,
+                 word_lengths: range = range(3, 11),
+                 word_file: str = COMMON_WORD_FILE) -> None:
+        """
+        The games are made from the common words, but any word
+        in `word_file` counts as a guess (and for the solutions)
+        """
+        # (forked workers would inherit, and so hold open, whatever connections
+        # were open when they started, so they come from a forkserver instead)
+        self.executor = ProcessPoolExecutor(processes, mp_context=multiprocessing.get_context('forkserver'))
+        self.timeout = timeout
+        self.store = GameStore(ttl)
+        self.word_lengths = word_lengths
+        self.word_file = word_file
+        self.valid_words = word_set(word_file)
+
+    async def run_in_pool(self, fn: Callable[..., Any], *args: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        try:
+            return await asyncio.wait_for(loop.run_in_executor(self.executor, fn, *args), self.timeout)
+        except (asyncio.TimeoutError, TimeoutError):
+            raise HTTPError(504, f"{fn.__name__} took more than {self.timeout}s")
+
+    def describe(self, game_id: str, game: GameSession) -> Dict[str, Any]:
+        return {
+            'id': game_id,
+            'constraints': game.constraints(),
+            'remaining': game.remaining_constraints(),
+            'guesses': game.guesses,
+            'needed': game.needed,
+            'solved': game.solved,
+        }
+
+    async def create(self, body: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        word_length = body.get('word_length', 5)
+        # (5.0 and True are `in` a range too)
+        if type(word_length) is not int or word_length not in self.word_lengths:
+            raise HTTPError(400, f"word_length must be in {self.word_lengths}")
+
+        seed_words = await self.run_in_pool(new_game, word_length)
+        game = GameSession(seed_words, self.valid_words)
+        return 201, self.describe(self.store.add(game), game)
+
+    async def guess(self, game_id: str, body: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        game = self.store.get(game_id)
+        word = body.get('word')
+
+        if not isinstance(word, str) or len(word) != game.word_length or not word.isalpha() or not word.islower():
+            raise HTTPError(400, f"word must be {game.word_length} lowercase letters")
+
+        accepted = game.guess(word)
+        return 200, {**self.describe(game_id, game), 'accepted': accepted}
+
+    async def hint(self, game_id: str) -> Tuple[int, Dict[str, Any]]:
+        """
+        The valid word that uses up the most of the remaining letters
+        """
+        game = self.store.get(game_id)
+        return 200, {'id': game_id, 'hint': game.hint()}
+
+    async def solution(self, game_id: str) -> Tuple[int, Dict[str, Any]]:
+        game = self.store.get(game_id)
+        minimal = await self.run_in_pool(solve, game.puzzle, game.word_length, self.word_file, self.timeout)
+        return 200, {'id': game_id, 'solution': minimal}
+
+    async def route(self, method: str, path: str, body: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        parts = [part for part in path.split('?')[0].split('/') if part]
+
+        if parts == ['games']:
+            if method != 'POST':
+                raise HTTPError(405, "use POST")
+            return await self.create(body)
+
+        if len(parts) == 3 and parts[0] == 'games':
+            _, game_id, action = parts
+            if action == 'guess' and method == 'POST':
+                return await self.guess(game_id, body)
+            elif action == 'hint' and method == 'GET':
+                return await self.hint(game_id)
+            elif action == 'solution' and method == 'GET':
+                return await self.solution(game_id)
+
+        raise HTTPError(404, f"no route for {method} {path}")
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Serves the requests on one (keep-alive) connection
+        """
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                try:
+                    method, path, _ = request_line.decode('latin-1').split(' ', 2)
+                    length = int(headers.get('content-length', 0))
+                    if length > MAX_BODY:
+                        raise HTTPError(413, "request body too large")
+                    raw = await reader.readexactly(length) if length else b''
+                    try:
+                        body = json.loads(raw) if raw else {}
+                    except ValueError:
+                        raise HTTPError(400, "body must be JSON")
+                    if not isinstance(body, dict):
+                        raise HTTPError(400, "body must be a JSON object")
+                    status, response = await self.route(method, path, body)
+                except HTTPError as e:
+                    status, response = e.status, {'error': e.message}
+                except ValueError:
+                    status, response = 400, {'error': "malformed request"}
+                except Exception:
+                    # a bug shouldn't take down the connection (or leave the request unanswered)
+                    status, response = 500, {'error': "internal server error"}
+
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                payload = json.dumps(response).encode()
+                writer.write(
+                    f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(payload)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + payload
+                )
+                await writer.drain()
+
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def evict_periodically(self, every: float = 60) -> None:
+        while True:
+            await asyncio.sleep(every)
+            self.store.evict()
+
+    async def serve(self, host: str = '127.0.0.1', port: int = 8000) -> asyncio.AbstractServer:
+        """
+        Starts listening (and sweeping out expired games), and returns the server
+        """
+        server = await asyncio.start_server(self.handle, host, port)
+        self.evictor = asyncio.ensure_future(self.evict_periodically())
+        return server
+
+    def close(self) -> None:
+        if getattr(self, 'evictor', None) is not None:
+            self.evictor.cancel()
+        self.executor.shutdown()
+
+
+async def main(port: int, word_file: str = COMMON_WORD_FILE) -> None:
+    game_server = GameServer(word_file=word_file)
+    server = await game_server.serve(port=port)
+    print("serving on", ', '.join(str(sock.getsockname()) for sock in server.sockets))
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        game_server.close()
+
+
+if __name__ == "__main__":
+    import sys
+
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8000
+    word_file = dictionary_file(sys.argv[2]) if len(sys.argv) > 2 else COMMON_WORD_FILE
+    asyncio.run(main(port, word_file))
@@ -0,0 +1,99 @@
+"""
+A game in progress, kept up to date one guess at a time.
+
+Rather than re-solving after every guess, the session keeps
+
+    remaining   the (packed) constraints that no guess has used yet
+                (updated with a single mask op per guess)
+    useful      the bitset of candidate words that would still use up
+                something (only the candidates that touched what the guess
+                just used up get re-checked)
+    needed      a lower bound on the guesses still needed
+                (the most letters left in any one column)
+
+so applying a guess (or asking for a hint) never looks at the whole dictionary.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, FrozenSet, List, Optional
+
+from typeshift.words import index_for, word_set
+from typeshift.constraints import (
+    NUM_LETTERS, Packed, apply, bits, conflicts, mask2chars, packed_words,
+    popcount, seed2packed, unpack, words_needed,
+)
+
+
+def constraint_strings(puzzle: Packed, word_length: int) -> List[str]:
+    return [''.join(mask2chars(mask)) for mask in unpack(puzzle, word_length)]
+
+
+class GameSession:
+    def __init__(self, seed_words: List[str], valid_words: Optional[FrozenSet[str]] = None) -> None:
+        self.seed_words = seed_words
+        self.word_length = len(seed_words[0])
+        self.puzzle = self.remaining = seed2packed(seed_words)
+        self.guesses: List[str] = []
+
+        valid_words = word_set() if valid_words is None else valid_words
+        self.candidates = index_for(valid_words).matching(constraint_strings(self.puzzle, self.word_length))
+        self.positions: Dict[str, int] = {word: i for i, word in enumerate(self.candidates)}
+        self.masks = packed_words(self.candidates)
+
+        # postings[bit] is the bitset of the candidates that use that (position, letter)
+        self.postings = [0] * (NUM_LETTERS * self.word_length)
+        for i, mask in enumerate(self.masks):
+            for bit in bits(mask):
+                self.postings[bit] |= 1 << i
+
+        self.useful = (1 << len(self.candidates)) - 1
+        self.needed = words_needed(self.remaining, self.word_length)
+
+    @property
+    def solved(self) -> bool:
+        return not self.remaining
+
+    def constraints(self) -> List[str]:
+        return constraint_strings(self.puzzle, self.word_length)
+
+    def remaining_constraints(self) -> List[str]:
+        return constraint_strings(self.remaining, self.word_length)
+
+    def guess(self, word: str) -> bool:
+        """
+        Plays the word if it's a valid word that fits the puzzle
+        (and returns whether it was)
+        """
+        i = self.positions.get(word)
+        if i is None:
+            return False
+
+        used_up = self.masks[i] & self.remaining
+        self.remaining = apply(self.masks[i], self.remaining)
+        self.guesses.append(word)
+
+        if used_up:
+            # only the candidates that used something we just used up can have stopped being useful
+            touched = 0
+            for bit in bits(used_up):
+                touched |= self.postings[bit]
+            for j in bits(touched & self.useful):
+                if not conflicts(self.masks[j], self.remaining):
+                    self.useful ^= 1 << j
+            self.needed = words_needed(self.remaining, self.word_length)
+
+        return True
+
+    def useful_words(self) -> List[str]:
+        """
+        The candidates that would still use up at least one letter
+        """
+        return [self.candidates[i] for i in bits(self.useful)]
+
+    def hint(self) -> Optional[str]:
+        """
+        The candidate that uses up the most of the remaining letters
+        """
+        best = max(bits(self.useful), key=lambda i: popcount(self.masks[i] & self.remaining), default=None)
+        return self.candidates[best] if best is not None else None
@@ -0,0 +1,110 @@
+"""
+Counters for seeing where a search spends its time. Every solver takes
+an optional `stats: SearchStats`, and only touches it when it's given one,
+so they cost (next to) nothing by default:
+
+    stats = SearchStats(trace_memory=True)
+    spec.minimal_solution(stats=stats)
+    print(stats.to_json())
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, ContextManager, Dict, Iterator, List, Optional, Tuple
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+import json
+import time
+import tracemalloc
+
+
+class SearchStats:
+    def __init__(self, trace_memory: bool = False, log: Optional[Callable[[str], None]] = None) -> None:
+        """
+        With `trace_memory` each phase also records the peak memory (via tracemalloc,
+        which slows things down), and `log` (e.g. `print`) gets told about each new best
+        """
+        self.trace_memory = trace_memory
+        self.log = log
+        self.start = time.perf_counter()
+
+        self.nodes = 0
+        self.frontier_peak = 0
+        self.prunes: Counter[str] = Counter()
+        self.phases: Dict[str, float] = {}
+        self.memory_peak = 0
+        # (seconds since the start, size) for each new best solution
+        self.incumbents: List[Tuple[float, int]] = []
+
+    def expand(self, frontier: int = 0) -> None:
+        """
+        Records that the search expanded a node with `frontier` others waiting
+        """
+        self.nodes += 1
+        if frontier > self.frontier_peak:
+            self.frontier_peak = frontier
+
+    def prune(self, reason: str) -> None:
+        self.prunes[reason] += 1
+
+    def improve(self, size: int, solution: Any = None) -> None:
+        self.incumbents.append((time.perf_counter() - self.start, size))
+        if self.log is not None:
+            self.log(f"{size} {solution}")
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        Times (and optionally traces the memory of) everything inside the block
+        """
+        started_tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        elif self.trace_memory and hasattr(tracemalloc, 'reset_peak'):
+            # (only on 3.9+; before that the peak includes whatever came earlier)
+            tracemalloc.reset_peak()
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+            if self.trace_memory:
+                self.memory_peak = max(self.memory_peak, tracemalloc.get_traced_memory()[1])
+            if started_tracing:
+                tracemalloc.stop()
+
+    def merge(self, other: SearchStats) -> None:
+        """
+        Adds in the stats from another search (e.g. one run in a worker process)
+        """
+        self.nodes += other.nodes
+        self.frontier_peak = max(self.frontier_peak, other.frontier_peak)
+        self.prunes.update(other.prunes)
+        for name, elapsed in other.phases.items():
+            self.phases[name] = self.phases.get(name, 0.0) + elapsed
+        self.memory_peak = max(self.memory_peak, other.memory_peak)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            'nodes': self.nodes,
+            'frontier_peak': self.frontier_peak,
+            'prunes': dict(self.prunes),
+            'phases': self.phases,
+            'memory_peak': self.memory_peak if self.trace_memory else None,
+            'incumbents': self.incumbents,
+        }
+
+    def to_json(self, **kwargs: Any) -> str:
+        return json.dumps(self.as_dict(), **kwargs)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # the log callback doesn't need to (and might not be able to) cross processes
+        return {**self.__dict__, 'log': None}
+
+
+def phase(stats: Optional[SearchStats], name: str) -> ContextManager[None]:
+    """
+    `stats.phase(name)`, or nothing at all if there's no `stats`
+    """
+    return stats.phase(name) if stats is not None else nullcontext()
@@ -1,43 +1,75 @@
-from typing import TypeVar
+from typing import Callable, List, Optional, TypeVar
 import dataclasses
+import os
 
-from typeshift.words import common_words
-from typeshift.talk1 import Spec
-from typeshift.talk4 import greedy_puzzle
+from typeshift.words import available_dictionaries, dictionary_file, word_set
+from typeshift.talk4 import length_index
+from typeshift.prefetch import GamePrefetcher
+from typeshift.catalog import Catalog
+from typeshift.session import GameSession
 
 import streamlit as st
 
 StateT = TypeVar('StateT')
 
-def persistent_game_state(initial_state: StateT) -> StateT:
+# serve games from here if it's been built (see typeshift/catalog.py)
+CATALOG_FILE = 'data/catalog.db'
+
+def persistent_game_state(make_initial_state: Callable[[], StateT]) -> StateT:
+    """
+    The session's game state, only made (once per session) if it doesn't have one yet
+    """
     session_id = st.report_thread.get_report_ctx().session_id
     session = st.server.server.Server.get_current()._get_session_info(session_id).session
     if not hasattr(session, '_gamestate'):
-        setattr(session, '_gamestate', initial_state)
+        setattr(session, '_gamestate', make_initial_state())
     return session._gamestate
 
 
+# shared by every session (and every rerun) in this process
+@st.cache(allow_output_mutation=True)
+def prefetcher() -> GamePrefetcher:
+    for word_length in range(3, 11):
+        length_index(word_length)
+    word_set()
+    return GamePrefetcher(range(3, 11))
+
+
+@st.cache(allow_output_mutation=True)
+def catalog() -> Optional[Catalog]:
+    return Catalog(CATALOG_FILE) if os.path.exists(CATALOG_FILE) else None
+
+
 @dataclasses.dataclass
 class GameState:
-    original_spec: Spec
-    remaining_spec: Spec
+    session: GameSession
 
 word_length = st.slider("word length", min_value=3, max_value=10, step=1, value=4)
+# (the games are always made from common words, but any word in the dictionary counts)
+dictionary = st.selectbox("dictionary", available_dictionaries())
 
-def make_spec()-> Spec:
-    game = greedy_puzzle(word_length)
-    return Spec.from_words(game, set(common_words))
+def make_game() -> List[str]:
+    entry = catalog().sample(word_length) if catalog() else None
+    return entry.words if entry else prefetcher().get(word_length)
 
-def make_state() -> GameState:
-    spec = make_spec()
-    return GameState(spec, spec)
+def make_session() -> GameSession:
+    return GameSession(make_game(), word_set(dictionary_file(dictionary)))
 
-state = persistent_game_state(initial_state=make_state()) 
+state = persistent_game_state(lambda: GameState(make_session()))
 
 if st.button("new game"):
-    new_spec = make_spec()
-    state.original_spec = state.remaining_spec = new_spec
+    state.session = make_session()
+
+session = state.session
+
+guess = st.text_input("guess").strip().lower()
+if guess and guess not in session.guesses and not session.guess(guess):
+    st.text(f"{guess} doesn't fit")
 
-for constraint in state.original_spec.constraints:
-    st.text(''.join(constraint))
+for constraint, remaining in zip(session.constraints(), session.remaining_constraints()):
+    st.text(' '.join(c if c in remaining else '.' for c in constraint))
 
+if session.solved:
+    st.text(f"solved in {len(session.guesses)}: {' '.join(session.guesses)}")
+else:
+    st.text(f"at least {session.needed} more")
@@ -19,12 +19,15 @@ time python typeshift/talk1.py awful bread climb empty hello knock light music n
 
 from __future__ import annotations
 
-from typing import List, Set, Optional, NamedTuple
+from typing import AbstractSet, Iterator, List, Optional, NamedTuple
 import itertools
-from collections import deque, defaultdict
+from collections import deque
 import random
 
-from typeshift.words import common_words as words
+from typeshift.words import index_for, word_set, words_of_length
+from typeshift.constraints import from_char_lists, packed_words
+from typeshift.cover import iter_minimum_covers, minimum_cover
+from typeshift.stats import SearchStats, phase
 
 # A constraint represents the choices for a single position: ['G', 'W', 'N']
 Constraint = List[str]
@@ -48,14 +51,22 @@ class Spec(NamedTuple):
     A Spec is the immutable part of a word game
     """
     constraints: Constraints
-    valid_words: Set[str] = set(words)
+    valid_words: AbstractSet[str] = word_set()
 
     def __repr__(self) -> str:
         return str(self.constraints)
 
     def brute_force(self) -> List[str]:
         """
-        Use brute force to find all valid words that satisfy the constraints
+        Find all valid words that satisfy the constraints by looking up
+        which words have each allowed letter in each position
+        """
+        return index_for(self.valid_words).matching(self.constraints)
+
+    def brute_force_product(self) -> List[str]:
+        """
+        Use (actual) brute force to find all valid words that satisfy the constraints;
+        this is the reference implementation for `brute_force`
         """
         return [
             word 
@@ -64,7 +75,7 @@ class Spec(NamedTuple):
         ]
 
     @staticmethod
-    def from_words(seed_words: List[str], valid_words: Set[str] = set(words)) -> Spec:
+    def from_words(seed_words: List[str], valid_words: AbstractSet[str] = word_set()) -> Spec:
         """
         Alternate constructor to construct a Spec from "seed words";
         for example: ["neat", "word", "game"]
@@ -72,13 +83,47 @@ class Spec(NamedTuple):
         constraints = [sorted(set(chars)) for chars in zip(*seed_words)]
         return Spec(constraints, valid_words)
 
-    def minimal_solution(self) -> List[str]:
+    def iter_minimal_solutions(self,
+                               limit: Optional[int] = None,
+                               timeout: Optional[float] = None) -> Iterator[List[str]]:
         """
-        Use BFS to find a minimal set of words that "spans" all the constraints.
+        Lazily yields every minimal solution (up to `limit` of them, or for up to `timeout` seconds)
         """
-        # first find *all* the words that are compatible with the constraints
         candidates = self.brute_force()
+        for chosen in iter_minimum_covers(packed_words(candidates), from_char_lists(self.constraints), limit, timeout):
+            yield [candidates[i] for i in chosen]
 
+    def minimal_solution(self, method: str = 'bfs', stats: Optional[SearchStats] = None) -> List[str]:
+        """
+        Use BFS to find a minimal set of words that "spans" all the constraints.
+
+        With method='iddfs' it's an iterative-deepening search instead,
+        which finds the same solution using memory linear in its size.
+
+        With method='exact' this instead uses the branch-and-bound
+        set cover solver in `typeshift.cover`, which is *much* faster.
+        """
+        # first find *all* the words that are compatible with the constraints
+        with phase(stats, 'enumerate'):
+            candidates = self.brute_force()
+
+        if method == 'exact':
+            with phase(stats, 'search'):
+                chosen = minimum_cover(packed_words(candidates), from_char_lists(self.constraints), stats)
+            return [candidates[i] for i in chosen]
+        elif method == 'iddfs':
+            with phase(stats, 'search'):
+                return self.iddfs_solution(candidates, stats)
+        elif method != 'bfs':
+            raise ValueError(f"unknown method: {method}")
+
+        with phase(stats, 'search'):
+            return self.bfs_solution(candidates, stats)
+
+    def bfs_solution(self, candidates: List[str], stats: Optional[SearchStats] = None) -> List[str]:
+        """
+        The BFS itself, over the given candidate words
+        """
         class QItem(NamedTuple):
             """
             We will use a queue of partially solved puzzles to do BFS.
@@ -94,7 +139,8 @@ class Spec(NamedTuple):
         while q:
             # pull the next game off the queue
             guessed, unsatisfied = q.popleft()
-            print(guessed, len(q))
+            if stats is not None:
+                stats.expand(len(q))
 
             for word in candidates:
                 # only add words in alphabetical order to avoid permutations
@@ -110,13 +156,50 @@ class Spec(NamedTuple):
         return []
 
 
-# create a 
-bylen = defaultdict(list)
-for word in words:
-    bylen[len(word)].append(word)
+    def iddfs_solution(self, candidates: List[str], stats: Optional[SearchStats] = None) -> List[str]:
+        """
+        Iterative deepening: depth-first search for a solution with at most `depth`
+        words, for depth = 1, 2, .... It finds the same solution as the BFS, but only
+        ever has one partially solved puzzle per word in memory instead of a whole
+        level's worth. Since each word uses up at most one letter per constraint,
+        a puzzle with more letters left in some constraint than words left can be skipped.
+        """
+        guessed: List[str] = []
+
+        def search(unsatisfied: Constraints, depth: int) -> bool:
+            if stats is not None:
+                stats.expand(len(guessed))
+
+            for word in candidates:
+                # only add words in alphabetical order to avoid permutations
+                if guessed and word <= guessed[-1]:
+                    continue
+
+                new_unsatisfied = apply(word, unsatisfied)
+                if new_unsatisfied == unsatisfied:
+                    continue
+
+                guessed.append(word)
+                if not any(new_unsatisfied):
+                    return True
+                if max(map(len, new_unsatisfied)) >= depth:
+                    if stats is not None:
+                        stats.prune('depth')
+                elif search(new_unsatisfied, depth - 1):
+                    return True
+                guessed.pop()
+
+            return False
+
+        for depth in range(max(1, max(map(len, self.constraints), default=0)), len(candidates) + 1):
+            if search(self.constraints, depth):
+                return guessed
+
+        return []
+
 
 def random_game(word_length: int, num_words: int) -> List[str]:
-    return sorted(random.sample(bylen[word_length], num_words))
+    return sorted(random.sample(words_of_length(word_length), num_words))
 
 game = random_game(word_length=5, num_words=6)
 game = ['cameo', 'heels', 'ovens', 'rapid', 'trade', 'wards']
@@ -141,4 +224,6 @@ if __name__ == "__main__":
     # game = game[:max_words]
     # print(game)
     puzz = Spec.from_words(game)
-    print(puzz.minimal_solution())
+    stats = SearchStats()
+    print(puzz.minimal_solution(stats=stats))
+    print(stats.to_json())
@@ -1,116 +1,191 @@
 """
 This contains the code for solving puzzles
 using the `Constraint = bitarray` 
-representation (but still the naive BFS method)
+representation (but still the naive BFS method,
+or with method='iddfs' an iterative-deepening DFS
+that only needs memory for the current path)
 
 time python typeshift/talk2.py awful bread climb empty hello knock light music north
 """
 
 from __future__ import annotations
 
-from typing import List, Set, Optional, NamedTuple, Iterable
-import itertools
-from collections import deque, defaultdict
+from typing import AbstractSet, Iterator, List, NamedTuple, Optional
+from array import array
 import random
-from string import ascii_lowercase
 
 from bitarray import bitarray
 
-from typeshift.words import common_words as words
+from typeshift.words import index_for, word_set, words_of_length
+from typeshift.constraints import (
+    Packed, apply, from_bitarray, from_bitarrays, mask2chars,
+    packed_words, seed2packed, to_bitarrays, words_needed,
+)
+from typeshift.cover import iter_minimum_covers, minimum_cover
+from typeshift.memo import TranspositionTable
+from typeshift.reduction import solve_reduced
+from typeshift.stats import SearchStats, phase
 
 Constraint = bitarray
 Constraints = List[Constraint]
 
-no_constraint = bitarray([False] * 26)
-
-def one_hot(n: int, i: int) -> bitarray:
-    oh = bitarray([False] * n)
-    oh[i] = True
-    return oh
-
-c2b = {
-    c: one_hot(26, i)
-    for i, c in enumerate(ascii_lowercase)
-}
-
-def constraint2chars(constraint: Constraint) -> List[str]:
-    return [c for c, b in zip(ascii_lowercase, constraint) if b]
-
-def chars2constraint(chars: Iterable[str]) -> Constraint:
-    constraint = no_constraint
-    for c in chars:
-        constraint = constraint | c2b[c]
-    return constraint
-
-def apply(word: str, constraints: Constraints) -> Constraints:
-    return [
-        constraint & ~c2b[c]
-        for c, constraint in zip(word, constraints)
-    ]
-
 class Spec(NamedTuple):
     constraints: Constraints
-    valid_words: Set[str] = set(words)
+    valid_words: AbstractSet[str] = word_set()
 
     def __repr__(self) -> str:
         return str(self.constraints)
 
     def brute_force(self) -> List[str]:
-        charses =[constraint2chars(constraint) for constraint in self.constraints]
-        return [
-            word 
-            for chars in itertools.product(*charses)
-            if (word := ''.join(chars)) in self.valid_words
-        ]
+        charses = [mask2chars(from_bitarray(constraint)) for constraint in self.constraints]
+        return index_for(self.valid_words).matching(charses)
 
     @staticmethod
-    def from_words(seed_words: List[str], valid_words: Set[str] = set(words)) -> Spec:
-        constraints = [chars2constraint(chars) for chars in zip(*seed_words)]
+    def from_words(seed_words: List[str], valid_words: AbstractSet[str] = word_set()) -> Spec:
+        constraints = to_bitarrays(seed2packed(seed_words), len(seed_words[0]))
         return Spec(constraints, valid_words)
 
-    def minimal_solution(self) -> List[str]:
+    def iter_minimal_solutions(self,
+                               limit: Optional[int] = None,
+                               timeout: Optional[float] = None) -> Iterator[List[str]]:
+        """
+        Lazily yields every minimal solution (up to `limit` of them, or for up to `timeout` seconds)
+        """
         candidates = self.brute_force()
+        for chosen in iter_minimum_covers(packed_words(candidates), from_bitarrays(self.constraints), limit, timeout):
+            yield [candidates[i] for i in chosen]
+
+    def minimal_solution(self,
+                         method: str = 'bfs',
+                         max_states: int = 1 << 20,
+                         stats: Optional[SearchStats] = None,
+                         reduce: bool = True) -> List[str]:
+        """
+        With `reduce` the search runs over the candidates left after
+        `typeshift.reduction.reduce_cover` (which can change which
+        minimal solution comes back, but not its size)
+        """
+        if method not in ('bfs', 'exact', 'iddfs'):
+            raise ValueError(f"unknown method: {method}")
+
+        def solve(words: List[str], masks: List[Packed], puzzle: Packed) -> List[str]:
+            if method == 'exact':
+                return [words[i] for i in minimum_cover(masks, puzzle, stats)]
+            elif method == 'iddfs':
+                return self.iddfs_solution(words, masks, stats, puzzle)
+            return self.bfs_solution(words, masks, max_states, stats, puzzle)
+
+        with phase(stats, 'enumerate'):
+            candidates = self.brute_force()
+            word_masks = packed_words(candidates)
+
+        puzzle = from_bitarrays(self.constraints)
+        if reduce:
+            return solve_reduced(candidates, word_masks, puzzle, solve, stats)
+        with phase(stats, 'search'):
+            return solve(candidates, word_masks, puzzle)
+
+    def bfs_solution(self,
+                     candidates: List[str],
+                     word_masks: List[Packed],
+                     max_states: int = 1 << 20,
+                     stats: Optional[SearchStats] = None,
+                     puzzle: Optional[Packed] = None) -> List[str]:
+        """
+        The BFS itself, over the given candidate words, for the given
+        (packed) puzzle (by default, the whole spec).
+
+        Rather than a queue of (guessed, unsatisfied) items, the frontier is two
+        flat arrays: node n is the game you get by adding word `words[n]` to node
+        `parents[n]` (node 0 is the empty game), so each node takes 12 bytes,
+        and its residual gets rebuilt (one AND per word) when it's popped.
+        """
+        def path(n: int) -> Iterator[int]:
+            while n > 0:
+                yield words[n]
+                n = parents[n]
+
+        # BFS reaches each residual first by one of the shortest ways there,
+        # so any later way there can be dropped. That means we can't rely on
+        # only adding words after the last one (the first way there might not
+        # have been the one in order), so with a table we try every word that helps.
+        table = TranspositionTable(max_states) if max_states else None
+        start = from_bitarrays(self.constraints) if puzzle is None else puzzle
+        parents, words = array('q', [-1]), array('i', [-1])
+        if table is not None:
+            table.seen(start)
+
+        n = -1
+        while n + 1 < len(parents):
+            n += 1
+            if stats is not None:
+                stats.expand(len(parents) - n - 1)
+
+            unsatisfied = start
+            for i in path(n):
+                unsatisfied = apply(word_masks[i], unsatisfied)
+
+            first = 0 if table is not None else words[n] + 1
+            for i in range(first, len(candidates)):
+                new_unsatisfied = apply(word_masks[i], unsatisfied)
+
+                if not new_unsatisfied:
+                    return [candidates[j] for j in sorted([i, *path(n)])]
+
+                if table is not None and table.seen(new_unsatisfied):
+                    if stats is not None:
+                        stats.prune('transposition')
+                    continue
+
+                parents.append(n)
+                words.append(i)
 
-        empty = bitarray([False] * len(candidates))
-        w2b = {
-            w: one_hot(len(candidates), i)
-            for i, w in enumerate(candidates)
-        }
-
-        def back_to_words(guessed: bitarray) -> List[str]:
-            return [candidates[i] for i, bit in enumerate(guessed) if bit]
-
-        class QItem(NamedTuple):
-            guessed: bitarray
-            unsatisfied: Constraints
-            max_word: int
-
-        q = deque([QItem(empty, self.constraints, -1)])
-
-        while q:
-            guessed, unsatisfied, max_word = q.popleft()
-            print(back_to_words(guessed), len(q))
-
-            for i, word in enumerate(candidates):
-                if i > max_word and guessed & w2b[word] == empty:
-                    new_unsatisfied = apply(word, unsatisfied)
-                    new_guessed = guessed | w2b[word]
-
-                    if all(constraint == no_constraint for constraint in new_unsatisfied):
-                        return back_to_words(new_guessed)
-
-
-                    q.append(QItem(new_guessed, new_unsatisfied, i))
+        return []
 
+    def iddfs_solution(self,
+                       candidates: List[str],
+                       word_masks: List[Packed],
+                       stats: Optional[SearchStats] = None,
+                       puzzle: Optional[Packed] = None) -> List[str]:
+        """
+        Iterative deepening: a depth-first search for a solution with at most
+        `depth` words, for depth = 1, 2, ..., which finds the same (first, minimal)
+        solution as the BFS but only ever holds the current path in memory.
+        Games that need more words than they have left (see `words_needed`) are pruned.
+        """
+        word_length = len(self.constraints)
+        start = from_bitarrays(self.constraints) if puzzle is None else puzzle
+        chosen: List[int] = []
+
+        def search(unsatisfied: Packed, first: int, depth: int) -> bool:
+            if stats is not None:
+                stats.expand(len(chosen))
+
+            for i in range(first, len(candidates)):
+                new_unsatisfied = apply(word_masks[i], unsatisfied)
+                if new_unsatisfied == unsatisfied:
+                    continue
+
+                chosen.append(i)
+                if not new_unsatisfied:
+                    return True
+                if words_needed(new_unsatisfied, word_length) >= depth:
+                    if stats is not None:
+                        stats.prune('depth')
+                elif search(new_unsatisfied, i + 1, depth - 1):
+                    return True
+                chosen.pop()
+
+            return False
+
+        for depth in range(max(words_needed(start, word_length), 1), len(candidates) + 1):
+            if search(start, 0, depth):
+                return [candidates[i] for i in chosen]
 
         return []
 
-bylen = defaultdict(list)
-for word in words:
-    bylen[len(word)].append(word)
-
 def random_game(word_length: int, num_words: int) -> List[str]:
-    return sorted(random.sample(bylen[word_length], num_words))
+    return sorted(random.sample(words_of_length(word_length), num_words))
 
 # game = random_game(word_length=5, num_words=5)
 
@@ -130,4 +205,6 @@ if __name__ == "__main__":
     # game = game[:max_words]
     # print(game)
     puzz = Spec.from_words(game)
-    print(puzz.minimal_solution())
+    stats = SearchStats()
+    print(puzz.minimal_solution(stats=stats))
+    print(stats.to_json())
@@ -2,6 +2,7 @@
 This contains the code for solving puzzles
 using a priority queue to pick at each step
 the puzzle with the fewest "excess characters"
+(or, with method='astar', the one whose A* estimate is smallest)
 
 time python typeshift/talk3.py awful bread climb empty hello knock light music north
 """
@@ -9,123 +10,181 @@ time python typeshift/talk3.py awful bread climb empty hello knock light music n
 
 from __future__ import annotations
 
-from typing import List, Set, Optional, NamedTuple, Iterable
-import itertools
-from collections import deque, defaultdict
+from typing import AbstractSet, List, NamedTuple, Optional
 import heapq
 import random
-from string import ascii_lowercase
 
 from bitarray import bitarray
 
-from typeshift.words import common_words as words
+from typeshift.words import index_for, word_set, words_of_length
+from typeshift.constraints import (
+    Packed, apply, from_bitarray, from_bitarrays, mask2chars,
+    packed_words, popcount, seed2packed, to_bitarrays, words_needed,
+)
+from typeshift.memo import TranspositionTable
+from typeshift.reduction import solve_reduced
+from typeshift.stats import SearchStats, phase
 
 Constraint = bitarray
 Constraints = List[Constraint]
 
-no_constraint = bitarray([False] * 26)
-
-def one_hot(n: int, i: int) -> bitarray:
-    oh = bitarray([False] * n)
-    oh[i] = True
-    return oh
-
-c2b = {
-    c: one_hot(26, i)
-    for i, c in enumerate(ascii_lowercase)
-}
-
-def constraint2chars(constraint: Constraint) -> List[str]:
-    return [c for c, b in zip(ascii_lowercase, constraint) if b]
-
-def chars2constraint(chars: Iterable[str]) -> Constraint:
-    constraint = no_constraint
-    for c in chars:
-        constraint = constraint | c2b[c]
-    return constraint
-
-def apply(word: str, constraints: Constraints) -> Constraints:
-    return [
-        constraint & ~c2b[c]
-        for c, constraint in zip(word, constraints)
-    ]
-
 class Spec(NamedTuple):
     constraints: Constraints
-    valid_words: Set[str] = set(words)
+    valid_words: AbstractSet[str] = word_set()
 
     def __repr__(self) -> str:
         return str(self.constraints)
 
     def brute_force(self) -> List[str]:
-        charses =[constraint2chars(constraint) for constraint in self.constraints]
-        return [
-            word 
-            for chars in itertools.product(*charses)
-            if (word := ''.join(chars)) in self.valid_words
-        ]
+        charses = [mask2chars(from_bitarray(constraint)) for constraint in self.constraints]
+        return index_for(self.valid_words).matching(charses)
 
     @staticmethod
-    def from_words(seed_words: List[str], valid_words: Set[str] = set(words)) -> Spec:
-        constraints = [chars2constraint(chars) for chars in zip(*seed_words)]
+    def from_words(seed_words: List[str], valid_words: AbstractSet[str] = word_set()) -> Spec:
+        constraints = to_bitarrays(seed2packed(seed_words), len(seed_words[0]))
         return Spec(constraints, valid_words)
 
-    def minimal_solution(self) -> List[str]:
-        candidates = self.brute_force()
-
-        empty = bitarray([False] * len(candidates))
-        w2b = {
-            w: one_hot(len(candidates), i)
-            for i, w in enumerate(candidates)
-        }
-
-        def back_to_words(guessed: bitarray) -> List[str]:
-            return [candidates[i] for i, bit in enumerate(guessed) if bit]
-
-        def excess_chars(guessed: bitarray) -> int:
-            seen_chars = [no_constraint] * len(self.constraints)
-            ec = 0
-            for word, included in zip(candidates, guessed):
-                if included:
-                    for i, c in enumerate(word):
-                        ec += sum(seen_chars[i] & c2b[c])
-                        seen_chars[i] = seen_chars[i] | c2b[c]
-            return ec
+    def minimal_solution(self,
+                         method: str = 'heap',
+                         max_states: int = 1 << 20,
+                         stats: Optional[SearchStats] = None,
+                         reduce: bool = True) -> List[str]:
+        """
+        With method='heap' this pops the partial solution with the fewest excess
+        characters first, which is fast but not guaranteed to be minimal.
+        With method='astar' it's an A* search, which is.
+        With `reduce` the search runs over the candidates left after
+        `typeshift.reduction.reduce_cover`.
+        """
+        if method not in ('heap', 'astar'):
+            raise ValueError(f"unknown method: {method}")
+
+        def solve(words: List[str], masks: List[Packed], puzzle: Packed) -> List[str]:
+            if method == 'astar':
+                return self.astar_solution(words, masks, max_states, stats, puzzle)
+            return self.heap_solution(words, masks, max_states, stats, puzzle)
+
+        with phase(stats, 'enumerate'):
+            candidates = self.brute_force()
+            word_masks = packed_words(candidates)
+
+        puzzle = from_bitarrays(self.constraints)
+        if reduce:
+            return solve_reduced(candidates, word_masks, puzzle, solve, stats)
+        with phase(stats, 'search'):
+            return solve(candidates, word_masks, puzzle)
+
+    def heap_solution(self,
+                      candidates: List[str],
+                      word_masks: List[Packed],
+                      max_states: int = 1 << 20,
+                      stats: Optional[SearchStats] = None,
+                      puzzle: Optional[Packed] = None) -> List[str]:
+        """
+        The excess-characters search itself, over the given candidate words,
+        for the given (packed) puzzle (by default, the whole spec)
+        """
+        def back_to_words(guessed: int) -> List[str]:
+            return [word for i, word in enumerate(candidates) if guessed >> i & 1]
 
         class QItem(NamedTuple):
+            """
+            `seen` is the union of the guessed words' masks, so that each
+            child's excess characters come straight from its parent's
+            """
             excess_chars: int
             negative_num_words: int
-            guessed: bitarray
-            unsatisfied: Constraints
+            guessed: int
+            unsatisfied: Packed
+            seen: Packed
             max_word: int
 
-        q = [QItem(0, 0, empty, self.constraints, -1)]
+        start = from_bitarrays(self.constraints) if puzzle is None else puzzle
+        q = [QItem(0, 0, 0, start, 0, -1)]
+
+        # each residual only gets expanded once (the first time it's popped, which is
+        # its cheapest way there so far), in which case every word that helps is a child
+        table = TranspositionTable(max_states) if max_states else None
+
+        while q:
+            ec, nnw, guessed, unsatisfied, seen, max_word = heapq.heappop(q)
+            if table is not None and table.seen(unsatisfied):
+                if stats is not None:
+                    stats.prune('transposition')
+                continue
+            if stats is not None:
+                stats.expand(len(q))
+
+            first = 0 if table is not None else max_word + 1
+            for i in range(first, len(candidates)):
+                new_unsatisfied = apply(word_masks[i], unsatisfied)
+                new_guessed = guessed | (1 << i)
+
+                if not new_unsatisfied:
+                    return back_to_words(new_guessed)
+
+                if table is not None and new_unsatisfied in table:
+                    continue
+
+                new_ec = ec + popcount(seen & word_masks[i])
+
+                qitem = QItem(new_ec, nnw - 1, new_guessed, new_unsatisfied, seen | word_masks[i], i)
+                heapq.heappush(q, qitem)
+
+        return []
+
+    def astar_solution(self,
+                       candidates: List[str],
+                       word_masks: List[Packed],
+                       max_states: int = 1 << 20,
+                       stats: Optional[SearchStats] = None,
+                       puzzle: Optional[Packed] = None) -> List[str]:
+        """
+        A* search where the cost so far is the number of words guessed and
+        the heuristic is `words_needed`, which never overestimates (each word
+        uses at most one letter per column) and drops by at most one per word,
+        so the first solution popped is a minimal one
+        """
+        word_length = len(self.constraints)
+
+        class AItem(NamedTuple):
+            # ties go to the deeper item, which is closer to a solution
+            estimate: int
+            negative_num_words: int
+            guessed: int
+            unsatisfied: Packed
+
+        start = from_bitarrays(self.constraints) if puzzle is None else puzzle
+        q = [AItem(words_needed(start, word_length), 0, 0, start)]
+        expanded = TranspositionTable(max_states)
 
         while q:
-            ec, nnw, guessed, unsatisfied, max_word = heapq.heappop(q)
-            print(ec, nnw, back_to_words(guessed), len(q))
+            _, nnw, guessed, unsatisfied = heapq.heappop(q)
 
-            for i, word in enumerate(candidates):
-                if i > max_word and guessed & w2b[word] == empty:
-                    new_unsatisfied = apply(word, unsatisfied)
-                    new_guessed = guessed | w2b[word]
+            if not unsatisfied:
+                return [word for i, word in enumerate(candidates) if guessed >> i & 1]
 
-                    if all(constraint == no_constraint for constraint in new_unsatisfied):
-                        return back_to_words(new_guessed)
+            if expanded.seen(unsatisfied):
+                if stats is not None:
+                    stats.prune('transposition')
+                continue
+            if stats is not None:
+                stats.expand(len(q))
 
-                    new_ec = excess_chars(new_guessed)
+            for i, word_mask in enumerate(word_masks):
+                new_unsatisfied = apply(word_mask, unsatisfied)
+                if new_unsatisfied == unsatisfied or new_unsatisfied in expanded:
+                    continue
 
-                    qitem = QItem(new_ec, nnw - 1, new_guessed, new_unsatisfied, i)
-                    heapq.heappush(q, qitem)
+                num_words = 1 - nnw
+                estimate = num_words + words_needed(new_unsatisfied, word_length)
+                heapq.heappush(q, AItem(estimate, -num_words, guessed | (1 << i), new_unsatisfied))
 
         return []
 
-bylen = defaultdict(list)
-for word in words:
-    bylen[len(word)].append(word)
 
 def random_game(word_length: int, num_words: int) -> List[str]:
-    return sorted(random.sample(bylen[word_length], num_words))
+    return sorted(random.sample(words_of_length(word_length), num_words))
 
 game = random_game(word_length=5, num_words=5)
 # game = ['cameo', 'heels', 'ovens', 'rapid', 'trade', 'wards']
@@ -149,4 +208,6 @@ if __name__ == "__main__":
     # game = game[:max_words]
     # print(game)
     puzz = Spec.from_words(game)
-    print(puzz.minimal_solution())
+    stats = SearchStats()
+    print(puzz.minimal_solution(stats=stats))
+    print(stats.to_json())
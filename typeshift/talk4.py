@@ -4,197 +4,617 @@ This contains the code for finding maximal
 no excess characters.
 
 python typeshift/talk4.py 4 10000
+python typeshift/talk4.py 4 10000 8    # split across 8 processes
+python typeshift/talk4.py 4 10000 8 data/corncob.txt    # with seed words from corncob
+python typeshift/talk4.py compare
+
+Every search takes a `seed_list` (see `typeshift.words.SeedList`), the words
+it builds games out of, which defaults to the common words.
 """
 
 from __future__ import annotations
 
-from typing import List, Set, Optional, NamedTuple, Iterable
-import itertools
-from collections import deque, defaultdict
-import heapq
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+from array import array
+from functools import lru_cache
 import random
-from string import ascii_lowercase
+import time
 
 import multiprocessing
-
-from bitarray import bitarray
-
-from typeshift.words import common_words as words
-# from typeshift.words import words
-
-Constraint = bitarray
-Constraints = List[Constraint]
-
-no_constraint = bitarray([False] * 26)
-
-def one_hot(n: int, i: int) -> bitarray:
-    oh = bitarray([False] * n)
-    oh[i] = True
-    return oh
-
-c2b = {
-    c: one_hot(26, i)
-    for i, c in enumerate(ascii_lowercase)
-}
-
-
-def maximal_puzzle(word_length: int) -> List[str]:
-    best = []
-
-    puzzle_words = [w for w in words if len(w) == word_length]
-    no_words = bitarray([False for _ in puzzle_words])
-
-    w2b = {
-        w: one_hot(len(puzzle_words), i)
-        for i, w in enumerate(puzzle_words)
-    }
-
-    class StackItem(NamedTuple):
-        words: bitarray
-        used_chars: Constraints
-        max_word: int
-
-    stack = [StackItem(no_words, [no_constraint] * word_length, -1)]
-
-    while stack:
-        pwords, used_chars, max_word = stack.pop()
-
-        if pwords.count() > len(best):
-            best = [puzzle_words[i] for i, b in enumerate(pwords) if b]
-            print(len(best), best)
-
-        for i in range(max_word + 1, len(puzzle_words)):
-            word = puzzle_words[i]
-            is_excess = any(
-                (c2b[c] & constraint).any()
-                for c, constraint in zip(word, used_chars)
-            )
-
-            if not is_excess:
-                new_words = pwords | w2b[word]
-                new_used_chars = [constraint | c2b[c] for c, constraint in zip(word, used_chars)]
-                stack.append(StackItem(new_words, new_used_chars, i))
-
-    return best
-
-
-def all_puzzles(word_length: int, puzzle_size: int) -> List[str]:
-    best = []
-
-    puzzle_words = [w for w in words if len(w) == word_length]
-    no_words = bitarray([False for _ in puzzle_words])
-
-    w2b = {
-        w: one_hot(len(puzzle_words), i)
-        for i, w in enumerate(puzzle_words)
-    }
-
-    class StackItem(NamedTuple):
-        words: bitarray
-        used_chars: Constraints
-        max_word: int
-
-    stack = [StackItem(no_words, [no_constraint] * word_length, -1)]
-
-    while stack:
-        pwords, used_chars, max_word = stack.pop()
-
-        if pwords.count() == puzzle_size:
-            print([puzzle_words[i] for i, b in enumerate(pwords) if b])
-            continue
-
-        for i in range(max_word + 1, len(puzzle_words)):
-            word = puzzle_words[i]
-            is_excess = any(
-                (c2b[c] & constraint).any()
-                for c, constraint in zip(word, used_chars)
-            )
-
-            if not is_excess:
-                new_words = pwords | w2b[word]
-                new_used_chars = [constraint | c2b[c] for c, constraint in zip(word, used_chars)]
-                stack.append(StackItem(new_words, new_used_chars, i))
-
-    return best
-
-
-def maximal_puzzle2(word_length: int) -> List[str]:
-    best = []
-
-    puzzle_words = [w for w in words if len(w) == word_length]
-    no_words = bitarray([False for _ in puzzle_words])
-    all_words = bitarray([True for _ in puzzle_words])
-
-    def valid(word: str, constraints: Constraints) -> bool:
+from multiprocessing.sharedctypes import Synchronized
+
+from typeshift.words import COMMON_SEEDS, SeedList
+from typeshift.constraints import NUM_LETTERS, Packed, bits, packed_words, popcount
+from typeshift.reduction import dominant_words
+from typeshift.stats import SearchStats, phase
+
+
+def back_to_words(pwords: int, puzzle_words: List[str]) -> List[str]:
+    return [word for i, word in enumerate(puzzle_words) if pwords >> i & 1]
+
+
+class ConflictIndex(NamedTuple):
+    """
+    Precomputed bitsets (over word indices) for searching for parsimonious games
+    """
+    puzzle_words: List[str]
+    masks: List[Packed]
+    # postings[position] is, for each letter that appears in that position,
+    # the bitset of words with that letter there
+    postings: List[List[int]]
+    # word_postings[i][position] is the posting for word i's letter in that position
+    word_postings: List[Tuple[int, ...]]
+    # conflicts[i] is the words that share a (position, letter) with word i
+    # (including word i itself)
+    conflicts: List[int]
+
+
+def conflict_index(puzzle_words: List[str]) -> ConflictIndex:
+    word_length = len(puzzle_words[0]) if puzzle_words else 0
+    postings = [[0] * NUM_LETTERS for _ in range(word_length)]
+
+    for i, word in enumerate(puzzle_words):
+        for position, c in enumerate(word):
+            postings[position][ord(c) - ord('a')] |= 1 << i
+
+    word_postings = [
+        tuple(postings[position][ord(c) - ord('a')] for position, c in enumerate(word))
+        for word in puzzle_words
+    ]
+
+    conflicts = [0] * len(puzzle_words)
+    for i, word_posting in enumerate(word_postings):
+        for posting in word_posting:
+            conflicts[i] |= posting
+
+    masks = packed_words(puzzle_words)
+    postings = [[posting for posting in position_postings if posting] for position_postings in postings]
+    return ConflictIndex(puzzle_words, masks, postings, word_postings, conflicts)
+
+
+@lru_cache(maxsize=None)
+def length_index(word_length: int, seed_list: SeedList = COMMON_SEEDS) -> ConflictIndex:
+    """
+    The (shared) conflict index for all the seed words of the given length
+    """
+    return conflict_index(seed_list.words(word_length))
+
+
+@lru_cache(maxsize=None)
+def length_dominant_words(word_length: int, seed_list: SeedList = COMMON_SEEDS) -> int:
+    """
+    The (shared) bitset of the seed words of the given length that aren't dominated
+    """
+    index = length_index(word_length, seed_list)
+    return dominant_words(index.postings, index.conflicts)
+
+
+def start_from(prefix: Tuple[int, ...], index: ConflictIndex, allowed: Optional[int] = None) -> int:
+    """
+    The bitset of the (allowed, by default all) words after the last one in
+    `prefix` that don't conflict with any of the (increasing) word indices in `prefix`
+    """
+    remaining = (1 << len(index.puzzle_words)) - 1 if allowed is None else allowed
+    for i in prefix:
+        remaining = after(i, remaining & ~index.conflicts[i])
+    return remaining
+
+
+def after(i: int, bitset: int) -> int:
+    """
+    Only the bits of `bitset` that come after bit i
+    """
+    return bitset >> (i + 1) << (i + 1)
+
+
+# a parsimonious game uses each letter at most once in each column,
+# so it can't have more than 26 words (and the search can't go deeper)
+MAX_WORDS = NUM_LETTERS
+
+
+class SearchStack:
+    """
+    The depth-first search state, as fixed-size arrays with one slot per depth:
+    `path[d]` is the index of the word chosen at depth d, and `todo[d]` is the
+    bitset of the words not yet tried there (all of them after `path[d - 1]`, and
+    not conflicting with any word on the path). Moving to a child writes one slot
+    of each, and backtracking is just stepping `depth` back, so nothing is copied
+    and the memory is proportional to the depth rather than to everything waiting
+    to be explored.
+    """
+    def __init__(self, index: ConflictIndex, prefix: Tuple[int, ...] = (), allowed: Optional[int] = None) -> None:
+        self.index = index
+        self.path = array('i', prefix) + array('i', [0] * MAX_WORDS)
+        self.todo = [0] * (len(prefix) + MAX_WORDS + 1)
+        self.root = self.depth = len(prefix)
+        self.todo[self.depth] = start_from(prefix, index, allowed)
+
+    def remaining(self) -> int:
         """
-        Here the word is valid if it doesn't match any of the constraints
+        The words that could still be added below the current node
         """
-        return not any(
-            (c2b[c] & constraint).any()
-            for c, constraint in zip(word, constraints)
-        )
-
-    w2b = {
-        w: one_hot(len(puzzle_words), i)
-        for i, w in enumerate(puzzle_words)
-    }
-
-    class StackItem(NamedTuple):
-        words: bitarray
-        used_chars: Constraints
-        remaining_words: bitarray
-        max_word: int
-
-    q = deque([StackItem(no_words, [no_constraint] * word_length, all_words, -1)])
-
-    while q:
-        pwords, used_chars, remaining_words, max_word = q.popleft()
-        print([puzzle_words[i] for i, b in enumerate(pwords) if b], remaining_words.count())
-
-        if pwords.count() >= len(best):
-            best = [puzzle_words[i] for i, b in enumerate(pwords) if b]
-            print(len(best), best)
+        return self.todo[self.depth]
 
-        for i in range(len(remaining_words)):
-            if remaining_words[i]:
-                word = puzzle_words[i]
-
-                if valid(word, used_chars):
-                    new_words = pwords | w2b[word]
-                    new_used_chars = [constraint | c2b[c] for c, constraint in zip(word, used_chars)]
-                    new_remaining_words = bitarray([ 
-                        b and j > max_word and valid(puzzle_words[j], new_used_chars)
-                        for j, b in enumerate(remaining_words) 
-                    ])
-
-                    stack.append(StackItem(new_words, new_used_chars, new_remaining_words, i))
-
-    return best    
+    def words(self) -> List[str]:
+        return [self.index.puzzle_words[i] for i in self.path[:self.depth]]
 
+    def prune(self) -> None:
+        """
+        Don't explore below the current node
+        """
+        self.todo[self.depth] = 0
 
-def greedy_puzzle(word_length: int) -> List[str]:
-    puzzle_words = [w for w in words if len(w) == word_length]
-    random.shuffle(puzzle_words)
+    def descend(self, needed: int) -> bool:
+        """
+        Moves to the next node (in depth-first order): the first untried word here,
+        as long as there are still `needed` untried words to choose from (since every
+        word after it only gets fewer), otherwise backtracking to the parent (where
+        one more is needed). Returns False once the whole subtree has been explored.
+        """
+        todo = self.todo
+        depth = self.depth
+
+        while True:
+            remaining = todo[depth]
+            if remaining and popcount(remaining) >= needed:
+                low = remaining & -remaining
+                i = low.bit_length() - 1
+                remaining ^= low
+                todo[depth] = remaining
+                self.path[depth] = i
+                depth += 1
+                todo[depth] = remaining & ~self.index.conflicts[i]
+                self.depth = depth
+                return True
+
+            if depth == self.root:
+                self.depth = depth
+                return False
+            depth -= 1
+            needed += 1
+
+
+def prefixes(index: ConflictIndex, depth: int, allowed: Optional[int] = None) -> List[Tuple[int, ...]]:
+    """
+    All the increasing, non-conflicting tuples of `depth` word indices;
+    these are the roots of the subtrees we hand out to worker processes.
+    """
+    result: List[Tuple[int, ...]] = [()]
+    for _ in range(depth):
+        result = [
+            prefix + (i,)
+            for prefix in result
+            for i in bits(start_from(prefix, index, allowed))
+        ]
+    return result
+
+
+def enough_letters(remaining: int, index: ConflictIndex, needed: int) -> bool:
+    """
+    Each column can only gain one word per distinct letter
+    that the remaining words have in that column
+    """
+    for position_postings in index.postings:
+        count = 0
+        for posting in position_postings:
+            if posting & remaining:
+                count += 1
+                if count >= needed:
+                    break
+        else:
+            return False
+    return True
+
+
+def enough_cliques(remaining: int, index: ConflictIndex, needed: int) -> bool:
+    """
+    Greedily partition the remaining words into groups that all conflict
+    with each other (e.g. all share a letter in some column); at most
+    one word can be chosen from each group.
+    """
+    cliques: List[int] = []
+    for i in bits(remaining):
+        not_conflicting = ~index.conflicts[i]
+        for k, clique in enumerate(cliques):
+            if not clique & not_conflicting:
+                cliques[k] = clique | (1 << i)
+                break
+        else:
+            cliques.append(1 << i)
+            if len(cliques) >= needed:
+                return True
+    return False
+
+
+def prune_reason(remaining: int, index: ConflictIndex, needed: int) -> Optional[str]:
+    """
+    Which bound (if any) shows that we can't add `needed` more words
+    from the remaining ones. The bounds are checked cheapest first.
+    """
+    if needed <= 0:
+        return None
+    elif popcount(remaining) < needed:
+        return 'words'
+    elif not enough_letters(remaining, index, needed):
+        return 'letters'
+    elif not enough_cliques(remaining, index, needed):
+        return 'cliques'
+    return None
+
+
+def can_grow_by(remaining: int, index: ConflictIndex, needed: int) -> bool:
+    """
+    Could we (possibly) add `needed` more words from the remaining ones?
+    """
+    return prune_reason(remaining, index, needed) is None
+
+
+def maximal_subtree(index: ConflictIndex,
+                    prefix: Tuple[int, ...],
+                    best_size: Synchronized,
+                    stats: Optional[SearchStats] = None,
+                    allowed: Optional[int] = None) -> List[str]:
+    """
+    Finds the largest parsimonious game that extends `prefix` (using only the
+    `allowed` words, by default all of them), as long as it's bigger than
+    `best_size`, which is shared with the other processes (and updated whenever
+    we find something bigger) so that everyone prunes against the best game found anywhere.
+
+    Subtrees that can't possibly beat `best_size` are pruned, so when the
+    search finishes the best game it found is provably optimal.
+    """
+    best = []
+    stack = SearchStack(index, prefix, allowed)
+
+    while True:
+        size = stack.depth
+        if stats is not None:
+            stats.expand(size)
+
+        if size > best_size.value:
+            with best_size.get_lock():
+                if size > best_size.value:
+                    best_size.value = size
+                    best = stack.words()
+                    if stats is not None:
+                        stats.improve(len(best), best)
+
+        needed = best_size.value - size + 1
+        reason = prune_reason(stack.remaining(), index, needed)
+        if reason:
+            if stats is not None:
+                stats.prune(reason)
+            stack.prune()
+
+        # (the lowest, most promising, index first)
+        if not stack.descend(needed):
+            return best
+
+
+def iter_subtree_puzzles(index: ConflictIndex,
+                         prefix: Tuple[int, ...],
+                         puzzle_size: int,
+                         deadline: Optional[float] = None,
+                         stats: Optional[SearchStats] = None) -> Iterator[List[str]]:
+    """
+    Yields the parsimonious games of size `puzzle_size` that extend `prefix`,
+    as they're found (giving up once `time.monotonic()` passes `deadline`)
+    """
+    stack = SearchStack(index, prefix)
+
+    while True:
+        if deadline is not None and time.monotonic() > deadline:
+            return
+
+        size = stack.depth
+        if stats is not None:
+            stats.expand(size)
+
+        needed = puzzle_size - size
+        if needed == 0:
+            yield stack.words()
+            stack.prune()
+        else:
+            reason = prune_reason(stack.remaining(), index, needed)
+            if reason:
+                if stats is not None:
+                    stats.prune(reason)
+                stack.prune()
+
+        if not stack.descend(needed):
+            return
+
+
+def puzzles_subtree(index: ConflictIndex,
+                    prefix: Tuple[int, ...],
+                    puzzle_size: int,
+                    stats: Optional[SearchStats] = None) -> List[List[str]]:
+    """
+    Finds all the parsimonious games of size `puzzle_size` that extend `prefix`
+    """
+    return list(iter_subtree_puzzles(index, prefix, puzzle_size, stats=stats))
+
+
+# each worker process builds its own word list once, in `init_worker`
+worker_state: Dict[str, Any] = {}
+
+
+def init_worker(word_length: int, best_size: Synchronized, collect_stats: bool = False,
+                seed_list: SeedList = COMMON_SEEDS) -> None:
+    worker_state['index'] = length_index(word_length, seed_list)
+    worker_state['dominant'] = length_dominant_words(word_length, seed_list)
+    worker_state['best_size'] = best_size
+    worker_state['collect_stats'] = collect_stats
+
+
+def task_stats() -> Optional[SearchStats]:
+    """
+    Fresh stats for each task (which get merged back in the main process)
+    """
+    return SearchStats() if worker_state['collect_stats'] else None
+
+
+def maximal_task(prefix: Tuple[int, ...]) -> Tuple[List[str], Optional[SearchStats]]:
+    stats = task_stats()
+    index, dominant = worker_state['index'], worker_state['dominant']
+    return maximal_subtree(index, prefix, worker_state['best_size'], stats, dominant), stats
+
+
+def puzzles_task(args: Tuple[Tuple[int, ...], int]) -> Tuple[List[List[str]], Optional[SearchStats]]:
+    prefix, puzzle_size = args
+    stats = task_stats()
+    return puzzles_subtree(worker_state['index'], prefix, puzzle_size, stats), stats
+
+
+def maximal_puzzle(word_length: int, processes: int = 1, split_depth: int = 1,
+                   stats: Optional[SearchStats] = None,
+                   seed_list: SeedList = COMMON_SEEDS) -> List[str]:
+    """
+    Finds a largest parsimonious game, searching only the words that aren't
+    dominated (see `typeshift.reduction.dominant_words`). With processes > 1
+    the search tree is split into subtrees (one per non-conflicting prefix of
+    `split_depth` words), which the worker processes pull off a shared queue
+    one at a time as they finish, so that a worker stuck with a big subtree
+    doesn't hold everyone else up.
+    """
+    with phase(stats, 'index'):
+        index = length_index(word_length, seed_list)
+    with phase(stats, 'reduce'):
+        dominant = length_dominant_words(word_length, seed_list)
+    best_size = multiprocessing.Value('i', 0)
+
+    if processes <= 1:
+        with phase(stats, 'search'):
+            return maximal_subtree(index, (), best_size, stats, dominant)
+
+    best: List[str] = []
+
+    initargs = (word_length, best_size, stats is not None, seed_list)
+
+    with phase(stats, 'search'), multiprocessing.Pool(processes, init_worker, initargs) as pool:
+        tasks = prefixes(index, split_depth, dominant)
+        for game, subtree_stats in pool.imap_unordered(maximal_task, tasks, chunksize=1):
+            if len(game) > len(best):
+                best = game
+                if stats is not None:
+                    stats.improve(len(best), best)
+            if stats is not None and subtree_stats is not None:
+                stats.merge(subtree_stats)
 
-    used_letters = [set() for _ in range(word_length)]
-    game = []
+    return best
 
-    for word in puzzle_words:
-        if not any(c in used for c, used in zip(word, used_letters)):
-            game.append(word)
-            used_letters = [used | {c}
-                            for c, used in zip(word, used_letters)]
 
-    return sorted(game)
+def all_puzzles(word_length: int, puzzle_size: int,
+                processes: int = 1, split_depth: int = 1,
+                stats: Optional[SearchStats] = None,
+                seed_list: SeedList = COMMON_SEEDS) -> List[List[str]]:
+    """
+    Finds all the parsimonious games with `puzzle_size` words,
+    optionally splitting the search across processes like `maximal_puzzle` does
+    """
+    with phase(stats, 'index'):
+        index = length_index(word_length, seed_list)
+
+    if processes <= 1:
+        with phase(stats, 'search'):
+            return puzzles_subtree(index, (), puzzle_size, stats)
+
+    split_depth = min(split_depth, puzzle_size)
+    tasks = [(prefix, puzzle_size) for prefix in prefixes(index, split_depth)]
+    games = []
+    initargs = (word_length, multiprocessing.Value('i', 0), stats is not None, seed_list)
+
+    with phase(stats, 'search'), multiprocessing.Pool(processes, init_worker, initargs) as pool:
+        for subtree_games, subtree_stats in pool.imap_unordered(puzzles_task, tasks, chunksize=1):
+            games.extend(subtree_games)
+            if stats is not None and subtree_stats is not None:
+                stats.merge(subtree_stats)
+
+    return games
+
+
+def iter_puzzles(word_length: int, puzzle_size: int,
+                 limit: Optional[int] = None,
+                 timeout: Optional[float] = None,
+                 seed_list: SeedList = COMMON_SEEDS) -> Iterator[List[str]]:
+    """
+    Lazily yields the parsimonious games with `puzzle_size` words (up to
+    `limit` of them, or for up to `timeout` seconds), only ever holding
+    the search stack in memory
+    """
+    if limit == 0:
+        return
+
+    deadline = None if timeout is None else time.monotonic() + timeout
+
+    games = iter_subtree_puzzles(length_index(word_length, seed_list), (), puzzle_size, deadline)
+    for count, game in enumerate(games, 1):
+        yield game
+        if count == limit:
+            return
+
+
+def maximal_puzzle2(word_length: int, stats: Optional[SearchStats] = None,
+                    seed_list: SeedList = COMMON_SEEDS) -> List[str]:
+    """
+    A simpler search for a largest parsimonious game: each state carries the
+    bitset of words that could still be added, and choosing a word filters it
+    with a single AND against that word's (precomputed) conflicts. The only
+    pruning is that a state needs enough remaining words to beat the best so far.
+    """
+    best: List[str] = []
+    stack = SearchStack(length_index(word_length, seed_list))
+
+    while True:
+        size = stack.depth
+        if stats is not None:
+            stats.expand(size)
+
+        if size > len(best):
+            best = stack.words()
+            if stats is not None:
+                stats.improve(len(best), best)
+
+        needed = len(best) - size + 1
+        if popcount(stack.remaining()) < needed:
+            if stats is not None:
+                stats.prune('words')
+            stack.prune()
+
+        if not stack.descend(needed):
+            return best
+
+
+def timed_search(search: Callable[[int], List[str]], word_length: int, results: multiprocessing.Queue) -> None:
+    start = time.perf_counter()
+    game = search(word_length)
+    results.put((len(game), time.perf_counter() - start))
+
+
+def compare_maximal_puzzles(word_lengths: Iterable[int] = range(3, 11), timeout: float = 60) -> None:
+    """
+    Times `maximal_puzzle` against `maximal_puzzle2` for each word length,
+    giving up on any search that takes more than `timeout` seconds
+    """
+    for word_length in word_lengths:
+        for search in [maximal_puzzle, maximal_puzzle2]:
+            results: multiprocessing.Queue = multiprocessing.Queue()
+            process = multiprocessing.Process(target=timed_search, args=(search, word_length, results))
+            process.start()
+            process.join(timeout)
+
+            if process.is_alive():
+                process.terminate()
+                print(f"{search.__name__:16} {word_length:2}  timed out after {timeout}s")
+            else:
+                size, elapsed = results.get()
+                print(f"{search.__name__:16} {word_length:2}  {size:2} words  {elapsed:.2f}s")
+
+
+def greedy_pass(index: ConflictIndex, order: List[int]) -> int:
+    """
+    Adds each word (in the given order) that doesn't conflict with the ones
+    already chosen, and returns the bitset of the chosen words
+    """
+    pwords, remaining = 0, (1 << len(index.puzzle_words)) - 1
+    for i in order:
+        if remaining >> i & 1:
+            pwords |= 1 << i
+            remaining &= ~index.conflicts[i]
+    return pwords
+
+
+def improve_game(pwords: int, index: ConflictIndex) -> int:
+    """
+    Local search: keep looking for a word in the game that can be
+    swapped out for two others (plus whatever else then fits),
+    until there isn't one
+    """
+    all_words = (1 << len(index.puzzle_words)) - 1
+    improved = True
+
+    while improved:
+        improved = False
+        chosen = bits(pwords)
+
+        for k, out in enumerate(chosen):
+            # the words that fit alongside everything but `out`
+            blocked = 0
+            for j, i in enumerate(chosen):
+                if j != k:
+                    blocked |= index.conflicts[i]
+            fits = all_words & ~blocked & ~(1 << out)
+
+            for a in bits(fits):
+                partners = fits & ~index.conflicts[a]
+                if partners:
+                    b = (partners & -partners).bit_length() - 1
+                    pwords = (pwords & ~(1 << out)) | (1 << a) | (1 << b)
+                    pwords |= greedy_pass(index, bits(partners & ~index.conflicts[b]))
+                    improved = True
+                    break
+
+            if improved:
+                break
+
+    return pwords
+
+
+def greedy_games(word_length: int, niter: int, improve: bool = True, seed: Any = None,
+                 seed_list: SeedList = COMMON_SEEDS) -> List[str]:
+    """
+    The best of `niter` randomized greedy passes (each one optionally
+    improved by local search)
+    """
+    index = length_index(word_length, seed_list)
+    rng = random.Random(seed)
+    order = list(range(len(index.puzzle_words)))
+    best = 0
+
+    for _ in range(niter):
+        rng.shuffle(order)
+        pwords = greedy_pass(index, order)
+        if improve:
+            pwords = improve_game(pwords, index)
+        if popcount(pwords) > popcount(best):
+            best = pwords
+
+    return back_to_words(best, index.puzzle_words)
+
+
+def greedy_task(args: Tuple[int, int, bool, Any, SeedList]) -> List[str]:
+    return greedy_games(*args)
+
+
+def greedy_puzzle(word_length: int, niter: int = 1, processes: int = 1, improve: bool = False,
+                  seed_list: SeedList = COMMON_SEEDS) -> List[str]:
+    """
+    A (hopefully large) parsimonious game, the best of `niter` randomized
+    greedy restarts. With processes > 1 the restarts are split across a pool,
+    each worker with its own random seed.
+    """
+    if processes <= 1:
+        return greedy_games(word_length, niter, improve, seed_list=seed_list)
+
+    seeds = [random.getrandbits(64) for _ in range(processes)]
+    tasks = [(word_length, niter // processes + (k < niter % processes), improve, seed, seed_list)
+             for k, seed in enumerate(seeds)]
+
+    with multiprocessing.Pool(processes) as pool:
+        return max(pool.imap_unordered(greedy_task, tasks), key=len)
 
 
 if __name__ == "__main__":
     import sys
+
+    if sys.argv[1] == 'compare':
+        compare_maximal_puzzles()
+        sys.exit()
+
     word_length = int(sys.argv[1])
     niter = int(sys.argv[2])
+    processes = int(sys.argv[3]) if len(sys.argv) > 3 else 1
+    seed_list = SeedList(sys.argv[4]) if len(sys.argv) > 4 else COMMON_SEEDS
 
-    best = max((greedy_puzzle(word_length) for _ in range(niter)), key=len)
+    best = greedy_puzzle(word_length, niter, processes, improve=True, seed_list=seed_list)
     print(len(best), best)
-
-
-
@@ -3,56 +3,37 @@ contains code for finding the most "satisfying" games;
 that is, for a given (word_length, num_words) combination,
 the "parsimonious" game with the most valid words in it
 
-python typeshift/talk5.py 3
+python typeshift/talk5.py 3 3
+python typeshift/talk5.py 5 4
+python typeshift/talk5.py 4 3 corncob    # counting the corncob words that fit
+
+The games are made of words from a `SeedList` (by default the common words),
+and scored by how many words from the dictionary (by default also the common
+words) fit them. Only the seed words get searched over; the dictionary just
+gets looked up through its index, so it can be much bigger.
 """
 
 from __future__ import annotations
-from typeshift.talk4 import maximal_puzzle
 
-from typing import List, Set, Optional, NamedTuple, Iterable
+from typing import AbstractSet, Iterable, List, Optional, NamedTuple, Tuple
+from functools import lru_cache
 import itertools
-from collections import deque, defaultdict
-import heapq
-import random
-from string import ascii_lowercase
 
 from bitarray import bitarray
 
-from typeshift.words import common_words as words
+from typeshift.words import (
+    COMMON_SEEDS, COMMON_WORD_FILE, SeedList, dictionary_file, index_for, word_index, word_set,
+)
+from typeshift.constraints import NUM_LETTERS, bits, from_bitarray, mask2chars, popcount, seed2packed, to_bitarrays
+from typeshift.talk4 import after, back_to_words, length_index, prune_reason
+from typeshift.stats import SearchStats
 
 Constraint = bitarray
 Constraints = List[Constraint]
 
-no_constraint = bitarray([False] * 26)
-
-def one_hot(n: int, i: int) -> bitarray:
-    oh = bitarray([False] * n)
-    oh[i] = True
-    return oh
-
-c2b = {
-    c: one_hot(26, i)
-    for i, c in enumerate(ascii_lowercase)
-}
-
-def constraint2chars(constraint: Constraint) -> List[str]:
-    return [c for c, b in zip(ascii_lowercase, constraint) if b]
-
-def chars2constraint(chars: Iterable[str]) -> Constraint:
-    constraint = no_constraint
-    for c in chars:
-        constraint = constraint | c2b[c]
-    return constraint
-
-def apply(word: str, constraints: Constraints) -> Constraints:
-    return [
-        constraint & ~c2b[c]
-        for c, constraint in zip(word, constraints)
-    ]
-
 class Spec(NamedTuple):
     constraints: Constraints
-    valid_words: Set[str] = set(words)
+    valid_words: AbstractSet[str] = word_set()
 
     def __repr__(self) -> str:
         return str(self.constraints)
@@ -61,28 +42,210 @@ class Spec(NamedTuple):
         return sum(c.count() for c in self.constraints)
 
     def brute_force(self) -> List[str]:
-        charses =[constraint2chars(constraint) for constraint in self.constraints]
-        return [
-            word 
-            for chars in itertools.product(*charses)
-            if (word := ''.join(chars)) in self.valid_words
-        ]
+        charses = [mask2chars(from_bitarray(constraint)) for constraint in self.constraints]
+        return index_for(self.valid_words).matching(charses)
 
     @staticmethod
-    def from_words(seed_words: List[str], valid_words: Set[str] = set(words)) -> Spec:
-        constraints = [chars2constraint(chars) for chars in zip(*seed_words)]
+    def from_words(seed_words: List[str], valid_words: AbstractSet[str] = word_set()) -> Spec:
+        constraints = to_bitarrays(seed2packed(seed_words), len(seed_words[0]))
         return Spec(constraints, valid_words)
 
-def most_satisfying(word_length: int, num_words: int = 3) -> List[str]:
-    puzzle_words = [w for w in words if len(w) == word_length]
+class FitIndex(NamedTuple):
+    """
+    For counting the dictionary words that fit a game made of seed words:
+    `postings[position]` has, for each letter that some seed word has in that
+    position, the pair (bitset of those seed words, bitset of the dictionary
+    words with that letter there), and `word_postings[i][position]` is the
+    dictionary posting for seed word i's letter in that position
+    """
+    postings: List[List[Tuple[int, int]]]
+    word_postings: List[Tuple[int, ...]]
+
+
+@lru_cache(maxsize=None)
+def fit_index(word_length: int, seed_list: SeedList = COMMON_SEEDS, word_file: str = COMMON_WORD_FILE) -> FitIndex:
+    seed_words = length_index(word_length, seed_list).puzzle_words
+    dictionary = word_index(word_file)
+
+    seed_postings = [[0] * NUM_LETTERS for _ in range(word_length)]
+    for i, word in enumerate(seed_words):
+        for position, c in enumerate(word):
+            seed_postings[position][ord(c) - ord('a')] |= 1 << i
+
+    postings = [
+        [(seed_posting, dictionary.posting(word_length, position, chr(ord('a') + letter)))
+         for letter, seed_posting in enumerate(position_postings) if seed_posting]
+        for position, position_postings in enumerate(seed_postings)
+    ]
+    word_postings = [
+        tuple(dictionary.posting(word_length, position, c) for position, c in enumerate(word))
+        for word in seed_words
+    ]
+    return FitIndex(postings, word_postings)
+
+
+class SearchItem(NamedTuple):
+    """
+    `words` is a bitset of the seed words in the game so far,
+    `remaining` is a bitset of the seed words (after the last one chosen)
+    that don't conflict with any of them, and `columns[i]` is a bitset
+    of the dictionary words whose i-th letter is in the game's i-th column
+    """
+    words: int
+    remaining: int
+    columns: Tuple[int, ...]
+
+
+def fits_every_column(columns: Iterable[int]) -> int:
+    """
+    The bitset of the words that fit in every column
+    """
+    fits = -1
+    for column in columns:
+        fits &= column
+    return fits
+
+
+def new_letter_postings(remaining: int, columns: Tuple[int, ...], fit: FitIndex) -> List[List[int]]:
+    """
+    For each column, the dictionary postings for the letters that the remaining
+    seed words have in that column, and that aren't in it yet
+    """
+    return [
+        [posting for seed_posting, posting in position_postings if seed_posting & remaining and not posting & column]
+        for column, position_postings in zip(columns, fit.postings)
+    ]
+
+
+def upper_bound_fits(remaining: int,
+                     columns: Tuple[int, ...],
+                     fit: FitIndex,
+                     new_postings: Optional[List[List[int]]] = None) -> int:
+    """
+    The bitset of words that could possibly fit the game once it's finished:
+    each column can only gain letters that the remaining words have in that column.
+    (`new_postings` are the postings for those letters, if we already have them.)
+    """
+    if new_postings is None:
+        new_postings = new_letter_postings(remaining, columns, fit)
+
+    grown_columns = []
+    for column, postings in zip(columns, new_postings):
+        for posting in postings:
+            column |= posting
+        grown_columns.append(column)
+
+    return fits_every_column(grown_columns)
+
+
+def upper_bound(remaining: int, columns: Tuple[int, ...], fit: FitIndex, needed: int) -> int:
+    """
+    The most valid words a game could end up with after adding `needed` more
+    of the remaining words: only the words in `upper_bound_fits` can fit, and
+    each column can only gain `needed` more letters.
+    """
+    new_postings = new_letter_postings(remaining, columns, fit)
+
+    fits = upper_bound_fits(remaining, columns, fit, new_postings)
+    bound = popcount(fits)
+
+    for column, postings in zip(columns, new_postings):
+        gains = sorted((popcount(fits & posting) for posting in postings), reverse=True)
+        bound = min(bound, popcount(fits & column) + sum(gains[:needed]))
+
+    return bound
+
+
+def best_last_word(remaining: int, columns: Tuple[int, ...], fit: FitIndex) -> Tuple[int, int]:
+    """
+    Finds the remaining word that makes the game fit the most valid words
+    (the first one, if there's a tie), and how many words that is.
+    """
+    could_fit = upper_bound_fits(remaining, columns, fit)
+    best_i, best_size = -1, -1
+
+    for i in bits(remaining):
+        fits = could_fit
+        for column, posting in zip(columns, fit.word_postings[i]):
+            fits &= column | posting
+        size = popcount(fits)
+        if size > best_size:
+            best_i, best_size = i, size
+
+    return best_i, best_size
+
+
+def most_satisfying(word_length: int,
+                    num_words: int = 3,
+                    stats: Optional[SearchStats] = None,
+                    seed_list: SeedList = COMMON_SEEDS,
+                    word_file: str = COMMON_WORD_FILE) -> List[str]:
+    """
+    Searches over the parsimonious games (i.e. only extending games
+    with words that share no letters with them), keeping track of which
+    words fit each column as we go, and pruning the games that can't
+    possibly end up with more valid words than the best one so far
+    """
+    index = length_index(word_length, seed_list)
+    fit = fit_index(word_length, seed_list, word_file)
+    best, best_size = [], -1
+
+    stack = [SearchItem(0, (1 << len(index.puzzle_words)) - 1, (0,) * word_length)]
+
+    while stack:
+        pwords, remaining, columns = stack.pop()
+        needed = num_words - popcount(pwords)
+        if stats is not None:
+            stats.expand(len(stack))
+
+        reason = prune_reason(remaining, index, needed)
+        if reason:
+            if stats is not None:
+                stats.prune(reason)
+            continue
+
+        if upper_bound(remaining, columns, fit, needed) <= best_size:
+            if stats is not None:
+                stats.prune('fits')
+            continue
+
+        if needed == 1:
+            i, num_valid = best_last_word(remaining, columns, fit)
+            if num_valid > best_size:
+                best, best_size = back_to_words(pwords | (1 << i), index.puzzle_words), num_valid
+                if stats is not None:
+                    stats.improve(best_size, best)
+            continue
+
+        children = bits(remaining)
+        del children[len(children) - needed + 1:]
+
+        for i in reversed(children):
+            stack.append(SearchItem(
+                pwords | (1 << i),
+                after(i, remaining & ~index.conflicts[i]),
+                tuple(column | posting for column, posting in zip(columns, fit.word_postings[i])),
+            ))
+
+    return best
+
+
+def most_satisfying_brute_force(word_length: int,
+                                num_words: int = 3,
+                                seed_list: SeedList = COMMON_SEEDS,
+                                word_file: str = COMMON_WORD_FILE) -> List[str]:
+    """
+    The reference implementation of `most_satisfying`, which checks every combination
+    """
+    puzzle_words = seed_list.words(word_length)
+    valid_words = word_set(word_file)
     best, best_size = (), -1
 
     for game in itertools.combinations(puzzle_words, num_words):
-        spec = Spec.from_words(game)
+        spec = Spec.from_words(game, valid_words)
         if spec.num_constraints() == word_length * num_words:
             size = len(spec.brute_force())
             if size > best_size:
-                print(game, size)
                 best, best_size = game, size
 
     return list(best)
@@ -95,9 +258,13 @@ if __name__ == "__main__":
     import sys
     word_length = int(sys.argv[1])
     num_words = int(sys.argv[2])
+    word_file = dictionary_file(sys.argv[3]) if len(sys.argv) > 3 else COMMON_WORD_FILE
 
-    game = most_satisfying(word_length, num_words)
+    # print each new best game as it's found
+    stats = SearchStats(log=print)
+    game = most_satisfying(word_length, num_words, stats, word_file=word_file)
 
-    spec = Spec.from_words(game)
+    spec = Spec.from_words(game, word_set(word_file))
     print(game)
-    print(spec.brute_force())
\ No newline at end of file
+    print(spec.brute_force())
+    print(stats.to_json())
\ No newline at end of file
@@ -1,14 +1,150 @@
+"""
+The word lists. Each one gets compiled (once) into a memory-mapped
+`typeshift.index.WordIndex` next to the text file, and nothing gets
+loaded until it's asked for:
+
+    from typeshift.words import common_words   # loads the common words index
+    from typeshift.words import words          # loads the corncob index
+
+There are two separate choices of word list: the dictionary of valid words
+(see `DICTIONARIES`), which only ever gets looked up through its index,
+so it can be as big as you like, and the `SeedList` of words that puzzles
+can be made from, which the searches over games branch on, so it should stay small.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, FrozenSet, Iterable, List, NamedTuple
+from functools import lru_cache
+import os
 import re
 
-# WORD_FILE = 'data/words_alpha.txt'
-# WORD_FILE = 'data/usr_share_dict_words.txt'
+from typeshift.index import WordIndex, compile_index
+
 COMMON_WORD_FILE = 'data/words_common.txt'
 WORD_FILE = 'data/corncob.txt'
+# (not in the repo; download it from https://github.com/dwyl/english-words)
+WORDS_ALPHA_FILE = 'data/words_alpha.txt'
+
+# the dictionaries of valid words, by name
+DICTIONARIES = {
+    'common': COMMON_WORD_FILE,
+    'corncob': WORD_FILE,
+    'words_alpha': WORDS_ALPHA_FILE,
+}
+
+
+def dictionary_file(dictionary: str) -> str:
+    """
+    The word file for one of the `DICTIONARIES` (or for any other word file, given its path)
+    """
+    return DICTIONARIES.get(dictionary, dictionary)
+
+
+def available_dictionaries() -> List[str]:
+    return [name for name, word_file in DICTIONARIES.items() if os.path.exists(word_file)]
+
+
+def read_words(word_file: str) -> List[str]:
+    """
+    The words in the file, one per line (anything after the word,
+    like the count in a frequency list, is ignored), without repeats
+    """
+    with open(word_file) as f:
+        words = [line.split()[0] if line.strip() else '' for line in f]
+        return list(dict.fromkeys(word for word in words if re.search(r"^[a-z]+$", word)))
+
+
+@lru_cache(maxsize=None)
+def word_counts(word_file: str) -> Dict[str, int]:
+    """
+    The count after each word in a frequency list ("word count" on each line),
+    or 0 for words that don't have one
+    """
+    counts = {}
+    with open(word_file) as f:
+        for line in f:
+            fields = line.split()
+            if fields:
+                counts[fields[0]] = int(fields[1]) if len(fields) > 1 else 0
+    return counts
+
+
+def index_file(word_file: str) -> str:
+    return os.path.splitext(word_file)[0] + '.idx'
+
+
+@lru_cache(maxsize=None)
+def word_index(word_file: str = COMMON_WORD_FILE) -> WordIndex:
+    """
+    The index for the given word file, (re)compiling it first if it's missing or stale
+    """
+    path = index_file(word_file)
+    if not os.path.exists(path) or os.path.getmtime(path) < os.path.getmtime(word_file):
+        compile_index(read_words(word_file), path)
+    try:
+        return WordIndex.load(path)
+    except ValueError:
+        # compiled by an older version
+        compile_index(read_words(word_file), path)
+        return WordIndex.load(path)
+
+
+# so that we can find the compiled index for any of the `word_set`s
+indexes_by_set: Dict[FrozenSet[str], WordIndex] = {}
+
+
+@lru_cache(maxsize=None)
+def word_set(word_file: str = COMMON_WORD_FILE) -> FrozenSet[str]:
+    """
+    The words as a (shared) set, for checking whether something is a word
+    """
+    valid_words = frozenset(word_index(word_file).all_words())
+    indexes_by_set[valid_words] = word_index(word_file)
+    return valid_words
+
+
+@lru_cache(maxsize=8)
+def in_memory_index(valid_words: FrozenSet[str]) -> WordIndex:
+    return WordIndex.from_words(valid_words)
+
+
+def index_for(valid_words: Iterable[str]) -> WordIndex:
+    """
+    The index for a collection of valid words: the compiled one if it's
+    one of the word lists, otherwise one built (and cached) just for them
+    """
+    valid_words = frozenset(valid_words)
+    index = indexes_by_set.get(valid_words)
+    return index if index is not None else in_memory_index(valid_words)
+
+
+def words_of_length(word_length: int, word_file: str = COMMON_WORD_FILE) -> List[str]:
+    return word_index(word_file).words(word_length)
+
+
+class SeedList(NamedTuple):
+    """
+    The words that puzzles may be made from: the ones in `word_file`
+    that appear at least `min_count` times (if it's a frequency list)
+    """
+    word_file: str = COMMON_WORD_FILE
+    min_count: int = 0
+
+    def words(self, word_length: int) -> List[str]:
+        words = words_of_length(word_length, self.word_file)
+        if self.min_count:
+            counts = word_counts(self.word_file)
+            words = [word for word in words if counts.get(word, 0) >= self.min_count]
+        return words
+
+
+COMMON_SEEDS = SeedList()
 
-with open(WORD_FILE) as f:
-    words = [line.strip() for line in f]
-    words = [word for word in words if re.search(r"^[a-z]+$", word)]
 
-with open(COMMON_WORD_FILE) as f:
-    common_words = [line.strip() for line in f]
-    common_words = [word for word in common_words if re.search(r"^[a-z]+$", word)]
+def __getattr__(name: str) -> Any:
+    if name == 'words':
+        return word_index(WORD_FILE).all_words()
+    elif name == 'common_words':
+        return word_index(COMMON_WORD_FILE).all_words()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")